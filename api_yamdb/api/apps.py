@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     name = "api"
     verbose_name = "API проекта YaMDb"
+
+    def ready(self):
+        from . import signals  # noqa: F401
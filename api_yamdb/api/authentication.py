@@ -0,0 +1,60 @@
+import copy
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from users.cache import user_cache
+from users.tokens import VERSION_CLAIM, get_token_version, user_from_claims
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя из базы.
+
+    Роль и флаги доступа берутся из claims токена, выданного
+    get_jwt_token. Токен принимается, только если его версия совпадает с
+    текущей версией пользователя. Версия меняется при изменении прав и
+    хранится в кэше не дольше USER_CACHE_TTL секунд; с кэшем в памяти
+    процесса в других процессах старый токен принимается до истечения
+    этого срока. Токены без claims проверяются обычным способом.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+        if validated_token[VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed(
+                "Токен отозван, получите новый.", code="token_revoked"
+            )
+        return user_from_claims(validated_token)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кэшем пользователей в памяти процесса.
+
+    Запись сбрасывается сигналами при сохранении и удалении пользователя,
+    а в других процессах устаревает не позже USER_CACHE_TTL секунд.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            )
+        cached = user_cache.get(user_id)
+        if cached is None:
+            cached = super().get_user(validated_token)
+            user_cache.set(user_id, cached)
+        # запрос получает свою копию, чтобы изменения не попадали в кэш
+        user = copy.copy(cached)
+        user._state = copy.copy(cached._state)
+        return user
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def namespace_key(namespace):
+    return f"api:namespace:{namespace}"
+
+
+def namespace_version(namespace):
+    key = namespace_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # начальная версия от времени не совпадёт с версиями, которые
+        # были до вытеснения ключа из кэша
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump(*namespaces):
+    """Делает недействительными ответы, закэшированные для namespaces."""
+    for namespace in namespaces:
+        try:
+            cache.incr(namespace_key(namespace))
+        except ValueError:
+            cache.set(namespace_key(namespace), time.time_ns(), None)
+
+
+class CacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+
+response_stats = CacheStats()
+
+
+class CachedResponseMixin:
+    """Кэширует ответы list по полному адресу запроса.
+
+    Адрес включает схему и хост, от которых зависят абсолютные ссылки
+    next/previous в ответе. Ключ включает версии пространств имён из
+    cache_namespaces, которые увеличиваются сигналами api.signals при
+    изменении данных. Другие действия подключаются вызовом
+    cached_response.
+    """
+
+    cache_namespaces = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def response_cache_key(self, request):
+        versions = ":".join(
+            str(namespace_version(namespace))
+            for namespace in self.cache_namespaces
+        )
+        url = hashlib.md5(
+            request.build_absolute_uri().encode("utf-8")
+        ).hexdigest()
+        return f"api:response:{versions}:{url}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            response_stats.hit()
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        response_stats.miss()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.API_RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы по ETag из метки версии данных.
+
+    Представление возвращает метку в get_etag_version, не формируя тело
+    ответа; при совпадении с If-None-Match сериализаторы не вызываются и
+    отдаётся 304.
+    """
+
+    def get_etag_version(self, request):
+        raise NotImplementedError
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = quote_etag(
+            f"{self.basename}-{self.get_etag_version(request)}-"
+            f"{request.accepted_renderer.format}"
+        )
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+        return response
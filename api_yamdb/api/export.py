@@ -0,0 +1,100 @@
+import csv
+import datetime as dt
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Comments, Review, Title
+
+# колонки выгрузки: имя в файле -> поле queryset.values()
+EXPORT_FIELDS = {
+    "titles": {
+        "id": "id",
+        "name": "name",
+        "year": "year",
+        "description": "description",
+        "category": "category__slug",
+        "reviews_count": "reviews_count",
+        "score_sum": "score_sum",
+    },
+    "reviews": {
+        "id": "id",
+        "title_id": "title_id",
+        "author": "author__username",
+        "text": "text",
+        "score": "score",
+        "pub_date": "pub_date",
+    },
+    "comments": {
+        "id": "id",
+        "title_id": "review__title_id",
+        "review_id": "review_id",
+        "author": "author__username",
+        "text": "text",
+        "pub_date": "pub_date",
+    },
+}
+EXPORT_FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CHUNK_SIZE = 2000
+
+
+def export_queryset(table, title_id=None):
+    if table == "titles":
+        queryset = Title.objects.all()
+        if title_id is not None:
+            queryset = queryset.filter(pk=title_id)
+    elif table == "reviews":
+        queryset = Review.objects.all()
+        if title_id is not None:
+            queryset = queryset.filter(title_id=title_id)
+    else:
+        queryset = Comments.objects.all()
+        if title_id is not None:
+            queryset = queryset.filter(review__title_id=title_id)
+    return queryset.order_by("id")
+
+
+def export_rows(table, title_id=None):
+    columns = EXPORT_FIELDS[table]
+    rows = export_queryset(table, title_id).values_list(
+        *columns.values()
+    ).iterator(chunk_size=CHUNK_SIZE)
+    names = tuple(columns)
+    for row in rows:
+        yield dict(zip(names, row))
+
+
+class Echo:
+    # csv.writer пишет в объект с методом write; возвращаем строку,
+    # чтобы отдавать её генератором без буфера в памяти
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def render_csv(rows, table):
+    encoder = DjangoJSONEncoder()
+    writer = csv.writer(Echo())
+    columns = tuple(EXPORT_FIELDS[table])
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            encoder.default(value)
+            if isinstance(value, dt.datetime) else value
+            for value in row.values()
+        )
+
+
+def export_stream(table, output="ndjson", title_id=None):
+    rows = export_rows(table, title_id)
+    if output == "csv":
+        return render_csv(rows, table)
+    return render_ndjson(rows)
@@ -1,6 +1,7 @@
 from django_filters import rest_framework as filters
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class CharFilterInFilter(filters.BaseInFilter, filters.CharFilter):
@@ -17,7 +18,12 @@ class TitleFilter(filters.FilterSet):
         field_name="genre__slug",
         lookup_expr="in"
     )
+    search = filters.CharFilter(method="filter_search")
 
     class Meta:
         model = Title
         fields = ("name", "year", "genre", "category")
+
+    def filter_search(self, queryset, name, value):
+        # полнотекстовый поиск по названию и описанию, по релевантности
+        return search_titles(queryset, value)
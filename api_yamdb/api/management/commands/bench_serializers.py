@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.rows import (
+    COMMENT_VALUES,
+    REVIEW_VALUES,
+    TITLE_VALUES,
+    comment_representation,
+    review_representation,
+    title_representation,
+)
+from api.serializers import (
+    CommentSerializer,
+    ReviewsSerializer,
+    TitleSerializer,
+)
+from reviews.benchmark import measure, seed
+from reviews.models import Comments, Review, Title
+
+PAGE_SIZES = (7, 100, 1000)
+
+# список: (queryset для сериализатора, сериализатор, поля values(),
+# построение ответа из строк); отзывы и комментарии выбираются по id, а не
+# по pub_date одного произведения, чтобы набрать страницу в 1000 строк
+# без сортировки всей таблицы
+LISTS = {
+    "titles": (
+        Title.objects.select_related("category").prefetch_related("genre"),
+        TitleSerializer,
+        TITLE_VALUES,
+        title_representation,
+    ),
+    "reviews": (
+        Review.objects.select_related("author").order_by("id"),
+        ReviewsSerializer,
+        REVIEW_VALUES,
+        review_representation,
+    ),
+    "comments": (
+        Comments.objects.select_related("author").order_by("id"),
+        CommentSerializer,
+        COMMENT_VALUES,
+        comment_representation,
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время построения страниц списков сериализаторами "
+        "и из строк values() (api.rows)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Добавить столько синтетических произведений перед замером.",
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed(options["seed"])
+        renderer = JSONRenderer()
+        for name, (queryset, serializer_class, values, represent) in (
+            LISTS.items()
+        ):
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for size in PAGE_SIZES:
+                def serialized():
+                    page = list(queryset.all()[:size])
+                    return renderer.render(
+                        serializer_class(page, many=True).data
+                    )
+
+                def rows():
+                    page = list(queryset.values(*values)[:size])
+                    return renderer.render(represent(page))
+
+                if serialized() != rows():
+                    self.stderr.write(
+                        f"  {size}: ответы сериализатора и api.rows "
+                        "различаются"
+                    )
+                    continue
+                before = measure(serialized, options["repeat"])
+                after = measure(rows, options["repeat"])
+                self.stdout.write(
+                    f"  {size:>5}: сериализатор {before:.2f} мс, "
+                    f"values() {after:.2f} мс, "
+                    f"ускорение x{before / after:.1f}"
+                )
@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORT_FIELDS, EXPORT_FORMATS, export_stream
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоково выгружает произведения, отзывы или комментарии "
+        "в формате NDJSON или CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", choices=tuple(EXPORT_FIELDS))
+        parser.add_argument(
+            "--output", choices=EXPORT_FORMATS, default="ndjson"
+        )
+        parser.add_argument(
+            "--title", type=int, help="Выгрузить данные одного произведения."
+        )
+        parser.add_argument(
+            "--file", help="Файл для записи, по умолчанию stdout."
+        )
+
+    def handle(self, *args, **options):
+        chunks = export_stream(
+            options["table"], options["output"], options["title"]
+        )
+        if options["file"]:
+            with open(options["file"], "w", encoding="utf-8",
+                      newline="") as target:
+                target.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
@@ -0,0 +1,138 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from reviews.benchmark import seed
+from reviews.models import Comments
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест GET-запросов к API: запросы идут через "
+        "WSGI-обработчик Django в несколько потоков без HTTP-сервера. "
+        "По умолчанию запрашиваются комментарии к последнему отзыву "
+        "с комментариями. С --asgi те же запросы идут через "
+        "api_yamdb.asgi из корутин в одном цикле событий."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", nargs="?")
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Отправлять запросы через ASGI-приложение; --threads "
+                 "задаёт число одновременных запросов.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Добавить столько синтетических произведений перед тестом.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed(options["seed"], comments_per_review=5)
+        url = options["url"] or self.default_url()
+        client = Client()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"{url}: статус {response.status_code}")
+        self.stdout.write(
+            f"{url}: {len(context.captured_queries)} запрос(а) к базе"
+        )
+
+        threads = options["threads"]
+        per_thread = max(options["requests"] // threads, 1)
+        started = time.perf_counter()
+        if options["asgi"]:
+            results = asyncio.run(self.run_asgi(url, threads, per_thread))
+        else:
+            with ThreadPoolExecutor(threads) as executor:
+                results = list(executor.map(
+                    lambda _: self.worker(url, per_thread), range(threads)
+                ))
+        elapsed = time.perf_counter() - started
+        timings = sorted(timing for result in results for timing in result[0])
+        errors = sum(result[1] for result in results)
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"запросов: {len(timings)}, ошибок: {errors}, "
+            f"{len(timings) / elapsed:.0f} запр/с"
+        )
+        self.stdout.write(
+            f"p50 {percentiles[49]:.2f} мс, p95 {percentiles[94]:.2f} мс, "
+            f"p99 {percentiles[98]:.2f} мс"
+        )
+
+    def default_url(self):
+        comment = Comments.objects.order_by("-id").values(
+            "review_id", "review__title_id"
+        ).first()
+        if comment is None:
+            raise CommandError("Нет комментариев: запустите с --seed N")
+        return (
+            f"/api/v1/titles/{comment['review__title_id']}/reviews/"
+            f"{comment['review_id']}/comments/"
+        )
+
+    def worker(self, url, count):
+        client = Client()
+        timings = []
+        errors = 0
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+                errors += response.status_code != 200
+        finally:
+            # у каждого потока своё соединение с базой
+            connection.close()
+        return timings, errors
+
+    async def run_asgi(self, url, concurrency, count):
+        from api_yamdb.asgi import application
+
+        parts = urlsplit(url)
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parts.path,
+            "query_string": parts.query.encode(),
+            "headers": [],
+            "server": ("testserver", 80),
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def worker():
+            timings = []
+            errors = 0
+            for _ in range(count):
+                status = []
+
+                async def send(message):
+                    if message["type"] == "http.response.start":
+                        status.append(message["status"])
+
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                timings.append((time.perf_counter() - started) * 1000)
+                errors += status != [200]
+            return timings, errors
+
+        return await asyncio.gather(*(worker() for _ in range(concurrency)))
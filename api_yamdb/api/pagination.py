@@ -0,0 +1,307 @@
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .cache import namespace_version
+
+
+class CountedPaginator(Paginator):
+    """Paginator, который берёт общее количество из count_func."""
+
+    def __init__(self, object_list, per_page, count_func=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        if self.count_func is None:
+            return super().count
+        return self.count_func()
+
+
+def view_max_page_size(view):
+    return getattr(view, "max_page_size", settings.API_MAX_PAGE_SIZE)
+
+
+class CountedPageNumberPagination(pagination.PageNumberPagination):
+    """Постраничная пагинация без COUNT(*) на каждую страницу.
+
+    Количество берётся из get_stored_count() представления, если оно его
+    хранит (счётчики отзывов и комментариев), иначе кэшируется на
+    API_COUNT_CACHE_TIMEOUT секунд по пути и параметрам фильтрации.
+    Ключ включает версии пространств имён cache_namespaces представления,
+    поэтому после изменения данных количество считается заново.
+    С параметром ``count=false`` количество не считается вовсе: ответ
+    содержит только ``next``/``previous``.
+
+    Размер страницы клиент задаёт параметром ``page_size``; он
+    ограничивается атрибутом max_page_size представления, по умолчанию
+    API_MAX_PAGE_SIZE.
+    """
+
+    django_paginator_class = CountedPaginator
+    count_query_param = "count"
+    page_size_query_param = "page_size"
+    with_count = True
+
+    def use_count(self, request):
+        return request.query_params.get(self.count_query_param) != "false"
+
+    def count_cache_key(self, request, view):
+        ignored = (
+            self.page_query_param,
+            self.page_size_query_param,
+            self.count_query_param,
+        )
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in ignored
+            for value in values
+        )
+        versions = [
+            namespace_version(namespace)
+            for namespace in getattr(view, "cache_namespaces", ())
+        ]
+        signature = repr((request.path, params, versions))
+        return "api:count:" + hashlib.md5(signature.encode()).hexdigest()
+
+    def get_count_func(self, queryset, request, view):
+        get_stored_count = getattr(view, "get_stored_count", None)
+        if get_stored_count is not None:
+            return get_stored_count
+        key = self.count_cache_key(request, view)
+        return lambda: cache.get_or_set(
+            key, queryset.count, settings.API_COUNT_CACHE_TIMEOUT
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.max_page_size = view_max_page_size(view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        if not self.use_count(request):
+            return self.paginate_without_count(queryset, page_size)
+        paginator = self.django_paginator_class(
+            queryset,
+            page_size,
+            count_func=self.get_count_func(queryset, request, view),
+        )
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def paginate_without_count(self, queryset, page_size):
+        try:
+            number = int(
+                self.request.query_params.get(self.page_query_param, 1)
+            )
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (number - 1) * page_size
+        # выбираем на одну строку больше страницы: по ней видно, есть ли
+        # следующая страница, а количество равно числу уже просмотренных
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+        paginator = self.django_paginator_class(
+            queryset, page_size, count_func=lambda: offset + len(rows)
+        )
+        self.page = Page(rows[:page_size], number, paginator)
+        self.with_count = False
+        return self.page.object_list
+
+    def get_paginated_response(self, data):
+        if self.with_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """Keyset-пагинация по всем полям порядка ``keyset_ordering``.
+
+    Курсор хранит значения всех полей порядка у граничной строки, и
+    страница выбирается условием вида
+    ``pub_date > p OR (pub_date = p AND id > i)`` без OFFSET, поэтому
+    стоимость страницы не зависит от глубины обхода и от числа отзывов с
+    одинаковой pub_date. Последним полем порядка должно быть уникальное
+    поле (id).
+    """
+
+    ordering = "-id"
+    page_size_query_param = "page_size"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "keyset_ordering", self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                order[1:] if order.startswith("-") else f"-{order}"
+                for order in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.position_filter(ordering, position)
+                )
+            except (ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # строка сверх страницы показывает, есть ли страница дальше
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    @staticmethod
+    def position_filter(ordering, position):
+        """Строки, идущие в порядке ordering после строки position."""
+        condition = Q()
+        equal = {}
+        for order, value in zip(ordering, position):
+            field = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.cursor.position if not self.page else (
+            self._get_position_from_instance(self.page[-1], self.ordering)
+        )
+        return self.encode_cursor(
+            pagination.Cursor(offset=0, reverse=False, position=position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.cursor.position if not self.page else (
+            self._get_position_from_instance(self.page[0], self.ordering)
+        )
+        return self.encode_cursor(
+            pagination.Cursor(offset=0, reverse=True, position=position)
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            reverse = bool(tokens.get("r", False))
+            position = tokens.get("p")
+            if position is not None:
+                position = [str(value) for value in position]
+                if len(position) != len(self.ordering):
+                    raise ValueError
+        except (TypeError, ValueError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        return pagination.Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor.position}
+        if cursor.reverse:
+            tokens["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(tokens).encode())
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode()
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip("-") for order in ordering]
+        if isinstance(instance, dict):
+            return [str(instance[field]) for field in fields]
+        return [str(getattr(instance, field)) for field in fields]
+
+
+class PageNumberOrKeysetPagination(CountedPageNumberPagination):
+    """Постраничная пагинация с переключением в keyset-режим.
+
+    Клиент включает keyset-режим параметром ``pagination=cursor``,
+    дальше навигация идёт по непрозрачному курсору из ``next``/``previous``.
+    Порядок выдачи задаётся атрибутом ``keyset_ordering`` представления.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.keyset = None
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = self.keyset_class()
+        self.keyset.max_page_size = view_max_page_size(view)
+        page = self.keyset.paginate_queryset(queryset, request, view)
+        self.display_page_controls = self.keyset.display_page_controls
+        return page
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+        return super().to_html()
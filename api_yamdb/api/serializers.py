@@ -1,36 +1,89 @@
 import datetime as dt
 
 from django.contrib.auth.tokens import default_token_generator
-from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
-from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 
 from reviews.models import Category, Comments, Genre, Review, Title
-from users.models import User
+from users.models import OutboxMessage, User
+
+
+def save_in_savepoint(save, *args):
+    # точка сохранения нужна только внутри открытой транзакции,
+    # в режиме autocommit ошибка вставки её не ломает
+    if transaction.get_connection().in_atomic_block:
+        with transaction.atomic():
+            return save(*args)
+    return save(*args)
+
+
+class UniqueUserMixin:
+    """Проверка уникальности username и email одним запросом.
+
+    Заменяет отдельные UniqueValidator на каждое поле и сохраняет их
+    сообщения об ошибках. Нарушение ограничения базы при одновременной
+    регистрации превращается в ответ 400 с теми же сообщениями.
+    """
+
+    unique_fields = ("username", "email")
+
+    def get_unique_errors(self, data):
+        values = {
+            field: data[field]
+            for field in self.unique_fields
+            if field in data
+        }
+        if not values:
+            return {}
+        lookup = Q()
+        for field, value in values.items():
+            lookup |= Q(**{field: value})
+        conflicts = User.objects.filter(lookup)
+        if self.instance is not None:
+            conflicts = conflicts.exclude(pk=self.instance.pk)
+        errors = {}
+        for row in conflicts.values(*values)[:len(values)]:
+            for field, value in values.items():
+                if row[field] == value:
+                    errors[field] = [UniqueValidator.message]
+        return errors
 
+    def validate(self, data):
+        data = super().validate(data)
+        errors = self.get_unique_errors(data)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
 
-class AuthSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
+    def save_unique(self, save, *args):
+        try:
+            return save_in_savepoint(save, *args)
+        except IntegrityError:
+            # запись с теми же данными успели создать параллельно
+            errors = self.get_unique_errors(self.validated_data)
+            raise serializers.ValidationError(
+                errors or UniqueValidator.message
+            )
+
+    def create(self, validated_data):
+        return self.save_unique(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self.save_unique(super().update, instance, validated_data)
+
+
+class AuthSerializer(UniqueUserMixin, serializers.ModelSerializer):
+    username = serializers.CharField()
+    email = serializers.EmailField()
 
     class Meta:
         model = User
         fields = ("username", "email")
-        validators = [
-            UniqueTogetherValidator(
-                queryset=User.objects.all(),
-                fields=("username", "email"),
-                message=(
-                    "Задано не уникальное сочетание полей email " "и username."
-                ),
-            )
-        ]
 
     def validate_username(self, value):
         # проверяем что в поле user передано не me
@@ -53,20 +106,18 @@ class TokenDataSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 "Неверный код подтверждения для указанного username"
             )
+        # передаём найденного пользователя дальше, чтобы не искать повторно
+        data["user"] = user
         return data
 
 
-class UsersSerializer(serializers.ModelSerializer):
+class UsersSerializer(UniqueUserMixin, serializers.ModelSerializer):
     role = serializers.ChoiceField(
         choices=User.ROLE_CHOICES,
         required=False,
     )
-    username = serializers.CharField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-    )
+    username = serializers.CharField()
+    email = serializers.EmailField()
 
     class Meta:
         model = User
@@ -84,15 +135,6 @@ class UsersSerializer(serializers.ModelSerializer):
             "bio",
             "role",
         )
-        validators = [
-            UniqueTogetherValidator(
-                queryset=User.objects.all(),
-                fields=("username", "email"),
-                message=(
-                    "Задано не уникальное сочетание полей email " "и username."
-                ),
-            )
-        ]
 
     def validate_username(self, value):
         # проверяем что в поле user передано не me
@@ -103,6 +145,22 @@ class UsersSerializer(serializers.ModelSerializer):
         return value
 
 
+class OutboxMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OutboxMessage
+        fields = (
+            "id",
+            "recipient",
+            "subject",
+            "status",
+            "attempts",
+            "last_error",
+            "created",
+            "next_attempt",
+            "sent",
+        )
+
+
 class GenreSerializer(serializers.ModelSerializer):
     slug = serializers.SlugField(
         max_length=50,
@@ -142,17 +200,25 @@ class ReviewsSerializer(serializers.ModelSerializer):
             "pub_date",
         )
 
-    def validate(self, data):
-        title = self.context.get("view").kwargs["title_id"]
-        user = self.context["request"].user
-        if (
-                user.reviews.filter(title__id=title).exists()
-                and self.context["request"].method != "PATCH"
-        ):
-            raise ValidationError(
-                "Нельзя публиковать более 1 отзыва на произведение"
-            )
-        return data
+    def create(self, validated_data):
+        # второй отзыв автора на произведение отсекает ограничение
+        # unique_title_author, без отдельного запроса на проверку
+        try:
+            return save_in_savepoint(super().create, validated_data)
+        except IntegrityError:
+            # другие нарушения целостности (например, произведение удалено
+            # параллельно) не превращаются в ошибку валидации
+            duplicate = Review.objects.filter(
+                title=validated_data["title"],
+                author=validated_data["author"],
+            ).exists()
+            if not duplicate:
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Нельзя публиковать более 1 отзыва на произведение"
+                ]
+            })
 
     def validate_score(self, value):
         if 10 >= value >= 1:
@@ -0,0 +1,42 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, GenreTitle, Title
+from reviews.signals import score_changed
+from users.models import User
+
+from .cache import bump
+
+# пространства имён закэшированных ответов, которые зависят от модели;
+# отзывы сбрасывают "titles" по score_changed, после обновления рейтинга
+DEPENDENT_NAMESPACES = {
+    Genre: ("genres", "titles"),
+    Category: ("categories", "titles"),
+    Title: ("titles",),
+    GenreTitle: ("titles",),
+    User: ("users",),
+}
+
+
+# версии меняются после фиксации транзакции: иначе параллельный запрос
+# может закэшировать под новой версией ещё не изменённые данные
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_responses(sender, **kwargs):
+    namespaces = DEPENDENT_NAMESPACES.get(sender)
+    if namespaces:
+        transaction.on_commit(partial(bump, *namespaces))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(partial(bump, "titles"))
+
+
+@receiver(score_changed)
+def invalidate_title_ratings(sender, **kwargs):
+    transaction.on_commit(partial(bump, "titles"))
@@ -6,9 +6,12 @@ from .views import (
     CategoryViewSet,
     CommentsViewSet,
     GenreViewSet,
+    OutboxViewSet,
     ReviewsViewSet,
     TitleViewSet,
     UsersViewSet,
+    cache_stats,
+    export_data,
     get_jwt_token,
 )
 
@@ -24,6 +27,11 @@ router1.register(
     UsersViewSet,
     basename="users",
 )
+router1.register(
+    r"v1/outbox",
+    OutboxViewSet,
+    basename="outbox",
+)
 router1.register(
     r"v1/titles/(?P<title_id>\d+)/reviews",
     ReviewsViewSet,
@@ -52,5 +60,7 @@ router1.register(
 
 urlpatterns = [
     path("v1/auth/token/", get_jwt_token),
+    path("v1/export/<str:table>/", export_data),
+    path("v1/stats/cache/", cache_stats),
     path("", include(router1.urls)),
 ]
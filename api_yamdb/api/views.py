@@ -1,7 +1,9 @@
-from django.db.models import Avg
+from functools import partial
+
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (
     filters,
@@ -11,15 +13,43 @@ from rest_framework import (
     status,
     viewsets,
 )
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title
-from users.models import User
+from reviews.leaderboard import ALL, title_leaderboard
+from reviews.models import (
+    HISTOGRAM_FIELDS,
+    Category,
+    Comments,
+    Genre,
+    Review,
+    Title,
+)
+from reviews.stats import score_stats
+from reviews.suggest import title_suggest_index
+from users import outbox
+from users.cache import user_cache
+from users.models import OutboxMessage, User
+from users.tokens import access_token_for_user
 
+from .cache import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    namespace_version,
+    response_stats,
+)
+from .export import CONTENT_TYPES, EXPORT_FIELDS, EXPORT_FORMATS, export_stream
 from .filters import TitleFilter
+from .pagination import (
+    CountedPageNumberPagination,
+    PageNumberOrKeysetPagination,
+)
 from .permissions import (
     AdminOrModerator,
     Admin,
@@ -27,11 +57,21 @@ from .permissions import (
     Owner,
     ReadOnly,
 )
+from .rows import (
+    COMMENT_VALUES,
+    REVIEW_VALUES,
+    TITLE_VALUES,
+    RowsListMixin,
+    comment_representation,
+    review_representation,
+    title_representation,
+)
 from .serializers import (
     AuthSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    OutboxMessageSerializer,
     ReviewsSerializer,
     TitleSerializer,
     TokenDataSerializer,
@@ -55,21 +95,17 @@ class AuthViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
         )
 
     def perform_create(self, serializer):
-        serializer.save()
-        user = User.objects.get(**serializer.validated_data)
+        user = serializer.save()
         confirmation_code = default_token_generator.make_token(user)
-        # отправляем письмо пользователю
-        send_mail(
+        # ставим письмо пользователю в очередь на отправку
+        outbox.enqueue(
             subject="Код подтверждения регистрации",
-            message=(
+            body=(
                 f"Код подтверждения регистрации ниже \n "
                 f"{confirmation_code}. \n Имя пользователя "
                 f"{serializer.validated_data['username']}"
             ),
-            from_email=None,
-            recipient_list=[
-                serializer.validated_data["email"],
-            ],
+            recipient=serializer.validated_data["email"],
         )
 
 
@@ -81,13 +117,53 @@ def get_jwt_token(request):
             serializer.errors,
             status=status.HTTP_400_BAD_REQUEST
         )
-    user = get_object_or_404(
-        User,
-        username=serializer.validated_data["username"]
+    token = access_token_for_user(serializer.validated_data["user"])
+    return Response(
+        {"token": str(token)},
+        status=status.HTTP_200_OK
+    )
+
+
+@api_view(["GET", ])
+@authentication_classes((JWTAuthentication,))
+@permission_classes((perm.IsAuthenticated & Admin,))
+def export_data(request, table):
+    output = request.query_params.get("output", "ndjson")
+    title_id = request.query_params.get("title")
+    if table not in EXPORT_FIELDS:
+        return Response(
+            {"table": [f"Допустимые значения: {', '.join(EXPORT_FIELDS)}."]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if output not in EXPORT_FORMATS:
+        return Response(
+            {"output": [f"Допустимые значения: {', '.join(EXPORT_FORMATS)}."]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if title_id is not None and not title_id.isdigit():
+        return Response(
+            {"title": ["Ожидается id произведения."]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    response = StreamingHttpResponse(
+        export_stream(table, output, title_id),
+        content_type=CONTENT_TYPES[output],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{table}.{output}"'
     )
-    token = RefreshToken.for_user(user)
+    return response
+
+
+@api_view(["GET", ])
+@authentication_classes((JWTAuthentication,))
+@permission_classes((perm.IsAuthenticated & Admin,))
+def cache_stats(request):
     return Response(
-        {"token": str(token.access_token)},
+        {
+            "users": user_cache.stats(),
+            "responses": response_stats.stats(),
+        },
         status=status.HTTP_200_OK
     )
 
@@ -98,7 +174,8 @@ class UsersViewSet(viewsets.ModelViewSet):
     lookup_field = "username"
     authentication_classes = (JWTAuthentication,)
     permission_classes = (perm.IsAuthenticated & Admin,)
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = CountedPageNumberPagination
+    cache_namespaces = ("users",)
     filter_backends = (filters.SearchFilter,)
     search_fields = ("=username",)
 
@@ -126,49 +203,144 @@ class UsersViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewsViewSet(viewsets.ModelViewSet):
-    serializer_class = ReviewsSerializer
+class OutboxViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = OutboxMessage.objects.all()
+    serializer_class = OutboxMessageSerializer
     authentication_classes = (JWTAuthentication,)
-    permission_classes = (Owner | AdminOrModerator | ReadOnly,)
+    permission_classes = (perm.IsAuthenticated & Admin,)
     pagination_class = pagination.PageNumberPagination
+    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filterset_fields = ("status",)
+    search_fields = ("=recipient",)
 
-    @property
+
+# поля для сериализаторов и сигналов отзывов и комментариев, остальные
+# (счётчики и метки версий) не загружаются
+REVIEW_FIELDS = (
+    "id", "title", "score", "text", "pub_date", "author__username"
+)
+COMMENT_FIELDS = ("id", "review", "text", "pub_date", "author__username")
+
+
+class ReviewsViewSet(
+    ConditionalGetMixin,
+    RowsListMixin,
+    viewsets.ModelViewSet,
+):
+    serializer_class = ReviewsSerializer
+    permission_classes = (Owner | AdminOrModerator | ReadOnly,)
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ("pub_date", "id")
+    # строки отзывов и комментариев дешёвые (api.rows), поэтому
+    # страницы могут быть крупнее, чем у произведений с жанрами
+    max_page_size = 1000
+    list_values = REVIEW_VALUES
+    list_representation = staticmethod(review_representation)
+
+    @cached_property
     def _title(self):
         return get_object_or_404(Title, pk=self.kwargs.get("title_id"))
 
+    @cached_property
+    def _title_counters(self):
+        # метка отзывов и их количество одним запросом; этот же запрос
+        # проверяет, что произведение существует
+        counters = Title.objects.filter(
+            pk=self.kwargs.get("title_id")
+        ).values_list("reviews_version", "reviews_count").first()
+        if counters is None:
+            raise Http404
+        return counters
+
     def get_queryset(self):
-        title = self._title
-        return title.reviews.all()
+        # отзывы выбираются по title_id без загрузки самого произведения,
+        # с именем автора из того же запроса
+        return Review.objects.filter(
+            title_id=self.kwargs.get("title_id")
+        ).select_related("author").only(*REVIEW_FIELDS)
+
+    def get_stored_count(self):
+        return self._title_counters[1]
+
+    def get_etag_version(self, request):
+        return f"{self.kwargs.get('title_id')}-{self._title_counters[0]}"
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def perform_create(self, serializer):
         title = self._title
         serializer.save(author=self.request.user, title=title)
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(
+    ConditionalGetMixin,
+    RowsListMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (Owner | AdminOrModerator | ReadOnly,)
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ("pub_date", "id")
+    max_page_size = 1000
+    list_values = COMMENT_VALUES
+    list_representation = staticmethod(comment_representation)
 
-    def get_queryset(self):
-        review = get_object_or_404(
-            Review,
+    @cached_property
+    def _review(self):
+        return get_object_or_404(
+            Review.objects.only("id"),
             pk=self.kwargs.get("review_id"),
-            title__pk=self.kwargs.get("title_id"),
+            title_id=self.kwargs.get("title_id"),
         )
-        return review.comments.all()
 
-    def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
+    @cached_property
+    def _review_counters(self):
+        counters = Review.objects.filter(
             pk=self.kwargs.get("review_id"),
-            title__pk=self.kwargs.get("title_id"),
+            title_id=self.kwargs.get("title_id"),
+        ).values_list("comments_version", "comments_count").first()
+        if counters is None:
+            raise Http404
+        return counters
+
+    def get_queryset(self):
+        # принадлежность отзыва произведению проверяется в том же запросе
+        return Comments.objects.filter(
+            review_id=self.kwargs.get("review_id"),
+            review__title_id=self.kwargs.get("title_id"),
+        ).select_related("author").only(*COMMENT_FIELDS)
+
+    def get_stored_count(self):
+        return self._review_counters[1]
+
+    def get_etag_version(self, request):
+        return f"{self.kwargs.get('review_id')}-{self._review_counters[0]}"
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
         )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def perform_create(self, serializer):
+        review = self._review
         serializer.save(author=self.request.user, review=review)
 
 
 class GenreViewSet(
+    CachedResponseMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -176,8 +348,8 @@ class GenreViewSet(
 ):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_namespaces = ("genres",)
     lookup_field = "slug"
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (perm.IsAuthenticated & Admin | ReadOnly,)
     pagination_class = pagination.PageNumberPagination
     filter_backends = (filters.SearchFilter, )
@@ -185,6 +357,7 @@ class GenreViewSet(
 
 
 class CategoryViewSet(
+    CachedResponseMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -192,19 +365,102 @@ class CategoryViewSet(
 ):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_namespaces = ("categories",)
     lookup_field = "slug"
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (perm.IsAuthenticated & Admin | ReadOnly,)
     pagination_class = pagination.PageNumberPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+SHORT_LIST_LIMIT = 10
+SHORT_LIST_MAX_LIMIT = 50
+
+
+def short_list_limit(request):
+    # размер коротких списков из памяти процесса: подсказок и рейтингов
+    limit = request.query_params.get("limit", str(SHORT_LIST_LIMIT))
+    if limit.isdigit() and 0 < int(limit) <= SHORT_LIST_MAX_LIMIT:
+        return int(limit)
+    return None
+
+
+def short_list_limit_error():
+    return Response(
+        {"limit": [f"Ожидается число от 1 до {SHORT_LIST_MAX_LIMIT}."]},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    RowsListMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Title.objects.select_related(
+        "category"
+    ).prefetch_related("genre")
     serializer_class = TitleSerializer
-    authentication_classes = (JWTAuthentication,)
+    cache_namespaces = ("titles",)
     permission_classes = (perm.IsAuthenticated & Admin | ReadOnly,)
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ("-id",)
+    list_values = TITLE_VALUES
+    list_representation = staticmethod(title_representation)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+
+    def get_etag_version(self, request):
+        return namespace_version("titles")
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            partial(self.cached_response, super().retrieve),
+            request,
+            *args,
+            **kwargs,
+        )
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        return self.conditional_response(
+            partial(self.cached_response, self._stats), request, pk=pk
+        )
+
+    def _stats(self, request, pk=None):
+        title = get_object_or_404(Title.objects.only(*HISTOGRAM_FIELDS), pk=pk)
+        return Response({"id": title.pk, **score_stats(title.histogram)})
+
+    @action(detail=False, methods=["get"])
+    def suggest(self, request):
+        limit = short_list_limit(request)
+        if limit is None:
+            return short_list_limit_error()
+        return Response(title_suggest_index.suggest(
+            request.query_params.get("q", ""), limit
+        ))
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        limit = short_list_limit(request)
+        if limit is None:
+            return short_list_limit_error()
+        scopes = [
+            (param, request.query_params[param])
+            for param in ("category", "genre")
+            if param in request.query_params
+        ]
+        if len(scopes) > 1:
+            return Response(
+                {"detail": "Укажите либо category, либо genre."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(title_leaderboard.top(
+            scopes[0] if scopes else ALL, limit
+        ))
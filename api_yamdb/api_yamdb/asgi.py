@@ -3,14 +3,153 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no ASGI handler and no async views, so requests are passed
+to the WSGI handler running in a bounded thread pool (ASGI_THREADS).
 """
 
+import asyncio
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
 
-application = get_asgi_application()
+
+class WsgiToAsgi:
+    """ASGI-приложение поверх WSGI-обработчика Django.
+
+    Обработчик, чтение тела ответа и его закрытие выполняются в одном
+    потоке пула, поэтому соединения с базой остаются привязаны к потоку,
+    как под WSGI-сервером. Части тела передаются клиенту по мере
+    готовности, потоковые ответы (выгрузка) не собираются в памяти.
+    """
+
+    def __init__(self, wsgi_application, threads):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            threads, thread_name_prefix="asgi"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        environ = self.environ(scope, body)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def put(item):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        future = loop.run_in_executor(
+            self.executor, self.run, environ, put
+        )
+        await self.send_messages(queue, send)
+        await future
+        await send({"type": "http.response.body", "body": b""})
+
+    async def read_body(self, receive):
+        """Тело запроса или None, если клиент отключился."""
+        body = BytesIO()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body.write(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body.seek(0)
+        return body
+
+    def run(self, environ, put):
+        """Выполняет WSGI-приложение в потоке пула.
+
+        Сообщения ответа передаются через put, None означает конец ответа.
+        """
+
+        def start_response(status, headers, exc_info=None):
+            put({
+                "type": "http.response.start",
+                "status": int(status.split(" ", 1)[0]),
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers
+                ],
+            })
+
+        try:
+            result = self.wsgi_application(environ, start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        put({
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": True,
+                        })
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+        finally:
+            put(None)
+
+    async def send_messages(self, queue, send):
+        while True:
+            message = await queue.get()
+            if message is None:
+                return
+            await send(message)
+
+    def environ(self, scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", ""),
+            # WSGI передаёт путь байтами в latin-1
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": str(server[0]),
+            "SERVER_PORT": str(server[1]),
+            "REMOTE_ADDR": client[0],
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": body,
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope.get("headers", ()):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                name = f"HTTP_{name}"
+            value = value.decode("latin-1")
+            if name in environ:
+                value = f"{environ[name]},{value}"
+            environ[name] = value
+        return environ
+
+
+application = WsgiToAsgi(get_wsgi_application(), settings.ASGI_THREADS)
@@ -77,17 +77,59 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "api_yamdb.wsgi.application"
 
+# Django 2.2 не умеет асинхронные представления: под ASGI-сервером
+# запросы обрабатываются в пуле из ASGI_THREADS потоков (api_yamdb.asgi)
+ASGI_THREADS = 16
+
 
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# SQLite с WAL и PRAGMA из api_yamdb.sqlite3 (переопределяются в
+# OPTIONS["PRAGMAS"]); соединение переиспользуется между запросами
+# потока до CONN_MAX_AGE секунд
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "api_yamdb.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        "CONN_MAX_AGE": 60,
+        "OPTIONS": {
+            "PRAGMAS": {},
+        },
+    }
+}
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# время жизни закэшированных ответов каталога, секунды
+API_RESPONSE_CACHE_TIMEOUT = 300
+
+# наибольший размер страницы, который клиент может запросить параметром
+# page_size (представление меняет его атрибутом max_page_size)
+API_MAX_PAGE_SIZE = 100
+
+# сколько секунд хранится количество объектов для пагинации списков
+API_COUNT_CACHE_TIMEOUT = 60
+
+# списки произведений, отзывов и комментариев строятся из строк values(),
+# минуя поля сериализаторов (api.rows.RowsListMixin)
+API_ROWS_LIST = True
+
+# индекс подсказок названий живёт в памяти процесса и перечитывается из базы
+# не реже чем раз в SUGGEST_INDEX_MAX_AGE секунд
+SUGGEST_INDEX_MAX_AGE = 300
+
+# рейтинги лучших произведений: байесовская оценка подтягивает среднюю
+# произведения к общей средней так, будто у него есть ещё
+# LEADERBOARD_MIN_REVIEWS отзывов со средней оценкой
+LEADERBOARD_MIN_REVIEWS = 5
+LEADERBOARD_MAX_AGE = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -136,6 +178,20 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 DEFAULT_FROM_EMAIL = "admin@yamdb.ru"
 
+# Очередь исходящих писем: "thread" — отправка фоновым потоком после
+# коммита, "worker" — только командой manage.py send_outbox
+OUTBOX_DELIVERY = "thread"
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+# задержка перед первой повторной попыткой, секунды
+OUTBOX_RETRY_DELAY = 60
+
+# Для чтения без запроса пользователя из базы на каждый запрос можно
+# указать "api.authentication.StatelessJWTAuthentication": роль и флаги
+# доступа берутся из claims токена, выданного /api/v1/auth/token/.
+# Другой вариант — "api.authentication.CachedJWTAuthentication" с кэшем
+# пользователей в памяти процесса (USER_CACHE_SIZE записей, USER_CACHE_TTL
+# секунд)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -143,6 +199,9 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 7,
 }
 
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=60),
@@ -0,0 +1,38 @@
+from django.db.backends.sqlite3 import base
+
+# значения по умолчанию для небольших инсталляций на SQLite: WAL позволяет
+# читать параллельно с записью, NORMAL в режиме WAL не теряет целостность
+# при сбое приложения, а busy_timeout заставляет писателей ждать
+# освобождения блокировки вместо ошибки «database is locked»
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    # отрицательное значение — размер кэша страниц в КиБ
+    "cache_size": -20000,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с PRAGMA, выполняемыми при открытии соединения.
+
+    PRAGMA задаются словарём OPTIONS["PRAGMAS"] поверх DEFAULT_PRAGMAS;
+    значение None отключает PRAGMA по умолчанию.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("PRAGMAS", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = {
+            **DEFAULT_PRAGMAS,
+            **self.settings_dict["OPTIONS"].get("PRAGMAS", {}),
+        }
+        for name, value in pragmas.items():
+            if value is not None:
+                connection.execute(f"PRAGMA {name} = {value}")
+        return connection
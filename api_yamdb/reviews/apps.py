@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_triggers(sender, using, **kwargs):
+    from .search import ensure_fts_triggers
+
+    ensure_fts_triggers(connections[using])
 
 
 class ReviewsConfig(AppConfig):
     name = "reviews"
     verbose_name = "Управление отзывами"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(ensure_search_triggers, sender=self)
@@ -0,0 +1,122 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from users.models import User
+
+from .management.commands.rebuild_ratings import rebuild_ratings
+from .models import Category, Comments, Genre, GenreTitle, Review, Title
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+
+def seed(titles=1000, reviews_per_title=20, comments_per_review=1):
+    """Заполняет базу синтетическими данными для замеров.
+
+    Записи добавляются к существующим; идентификаторы назначаются
+    явно, чтобы связывать объекты без чтения их обратно из базы.
+    """
+    password = make_password(None)
+    now = timezone.now()
+    with transaction.atomic():
+        first_user = next_id(User)
+        users = [
+            User(
+                id=first_user + number,
+                username=f"bench_{first_user + number}",
+                email=f"bench_{first_user + number}@yamdb.fake",
+                password=password,
+            )
+            for number in range(max(reviews_per_title, 1))
+        ]
+        User.objects.bulk_create(users)
+
+        first_category = next_id(Category)
+        categories = [
+            Category(
+                id=first_category + number,
+                name=f"Категория {first_category + number}",
+                slug=f"bench-category-{first_category + number}",
+            )
+            for number in range(5)
+        ]
+        Category.objects.bulk_create(categories)
+        first_genre = next_id(Genre)
+        genres = [
+            Genre(
+                id=first_genre + number,
+                name=f"Жанр {first_genre + number}",
+                slug=f"bench-genre-{first_genre + number}",
+            )
+            for number in range(20)
+        ]
+        Genre.objects.bulk_create(genres)
+
+        first_title = next_id(Title)
+        Title.objects.bulk_create(
+            (
+                Title(
+                    id=first_title + number,
+                    name=f"Произведение {first_title + number}",
+                    year=random.randint(1900, now.year),
+                    description="Описание",
+                    category_id=random.choice(categories).id,
+                )
+                for number in range(titles)
+            ),
+        )
+        GenreTitle.objects.bulk_create(
+            (
+                GenreTitle(title_id=first_title + number, genre_id=genre.id)
+                for number in range(titles)
+                for genre in random.sample(genres, 2)
+            ),
+        )
+
+        first_review = next_id(Review)
+        review_ids = []
+        reviews = []
+        for number in range(titles):
+            for author in users[:reviews_per_title]:
+                review_id = first_review + len(review_ids)
+                review_ids.append(review_id)
+                reviews.append(Review(
+                    id=review_id,
+                    title_id=first_title + number,
+                    author_id=author.id,
+                    text="Текст отзыва",
+                    score=random.randint(1, 10),
+                    pub_date=now,
+                ))
+        Review.objects.bulk_create(reviews)
+        Comments.objects.bulk_create(
+            (
+                Comments(
+                    review_id=review_id,
+                    author_id=users[number % len(users)].id,
+                    text="Текст комментария",
+                    pub_date=now,
+                )
+                for review_id in review_ids
+                for number in range(comments_per_review)
+            ),
+        )
+    rebuild_ratings()
+    return first_title, first_title + titles - 1
+
+
+def measure(func, repeat=20):
+    """Медианное время выполнения func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,154 @@
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from .memory_index import ProcessIndex
+
+ALL = ("all", None)
+
+
+def weighted_rating(count, score_sum, mean, min_reviews):
+    # байесовская оценка (как в IMDb): средняя произведения, подтянутая
+    # к средней по всем отзывам тем сильнее, чем меньше у него отзывов
+    return (score_sum + min_reviews * mean) / (count + min_reviews)
+
+
+class Leaderboards:
+    """Отсортированные рейтинги произведений: общий и по разделам.
+
+    Ключ рейтинга — (-weighted_rating, -id), поэтому лучшие произведения
+    стоят в начале списка и первые K читаются срезом.
+    """
+
+    def __init__(self, min_reviews):
+        self.min_reviews = min_reviews
+        self.titles = {}
+        self.boards = {}
+        self.reviews_count = 0
+        self.score_sum = 0
+
+    @property
+    def mean(self):
+        if not self.reviews_count:
+            return 0
+        return self.score_sum / self.reviews_count
+
+    def add(self, title_id, name, count, score_sum, category, genres):
+        self.reviews_count += count
+        self.score_sum += score_sum
+        self.place(title_id, name, count, score_sum, category, genres)
+
+    def place(self, title_id, name, count, score_sum, category, genres,
+              keep_sorted=True):
+        if not count:
+            return
+        key = (
+            -weighted_rating(count, score_sum, self.mean, self.min_reviews),
+            -title_id,
+        )
+        scopes = [ALL, *(("genre", slug) for slug in genres)]
+        if category is not None:
+            scopes.append(("category", category))
+        self.titles[title_id] = (key, name, count, score_sum, scopes)
+        for scope in scopes:
+            board = self.boards.setdefault(scope, [])
+            if keep_sorted:
+                insort(board, key)
+            else:
+                board.append(key)
+
+    def remove(self, title_id):
+        entry = self.titles.pop(title_id, None)
+        if entry is None:
+            return
+        key, _, count, score_sum, scopes = entry
+        self.reviews_count -= count
+        self.score_sum -= score_sum
+        for scope in scopes:
+            board = self.boards[scope]
+            del board[bisect_left(board, key)]
+
+    def top(self, scope, limit):
+        result = []
+        for key in self.boards.get(scope, ())[:limit]:
+            title_id = -key[1]
+            _, name, count, score_sum, _ = self.titles[title_id]
+            result.append({
+                "id": title_id,
+                "name": name,
+                "rating": int(score_sum / count),
+                "weighted_rating": round(-key[0], 2),
+                "reviews_count": count,
+            })
+        return result
+
+
+class TitleLeaderboard(ProcessIndex):
+    """Рейтинги лучших произведений по байесовской оценке в памяти процесса.
+
+    Изменение отзывов произведения перечитывает из базы только его
+    счётчики и переставляет его в рейтингах. Позиции остальных
+    произведений считаются по средней оценке на момент их вставки и
+    выравниваются при плановой перезагрузке.
+    """
+
+    def __init__(self, max_age, min_reviews):
+        super().__init__(max_age)
+        self.min_reviews = min_reviews
+
+    def fetch(self, titles):
+        from .models import GenreTitle
+
+        genres = {}
+        rows = GenreTitle.objects.filter(title__in=titles).values_list(
+            "title_id", "genre__slug"
+        )
+        for title_id, slug in rows.iterator(chunk_size=5000):
+            genres.setdefault(title_id, []).append(slug)
+        rows = titles.values_list(
+            "id", "name", "reviews_count", "score_sum", "category__slug"
+        )
+        for row in rows.iterator(chunk_size=5000):
+            yield (*row, genres.get(row[0], ()))
+
+    def build(self):
+        from .models import Title
+
+        boards = Leaderboards(self.min_reviews)
+        rated = list(self.fetch(Title.objects.filter(reviews_count__gt=0)))
+        # средняя оценка нужна до расчёта первых позиций
+        boards.reviews_count = sum(row[2] for row in rated)
+        boards.score_sum = sum(row[3] for row in rated)
+        for row in rated:
+            boards.place(*row, keep_sorted=False)
+        for board in boards.boards.values():
+            board.sort()
+        return boards
+
+    def refresh(self, title_id):
+        from .models import Title
+
+        if not self.loaded:
+            return
+        rows = list(self.fetch(Title.objects.filter(pk=title_id)))
+        with self._lock:
+            if self._snapshot is None:
+                return
+            self._snapshot.remove(title_id)
+            for row in rows:
+                self._snapshot.add(*row)
+
+    def remove(self, title_id):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.remove(title_id)
+
+    def top(self, scope=ALL, limit=10):
+        snapshot = self.ensure_loaded()
+        with self._lock:
+            return snapshot.top(scope, limit)
+
+
+title_leaderboard = TitleLeaderboard(
+    settings.LEADERBOARD_MAX_AGE, settings.LEADERBOARD_MIN_REVIEWS
+)
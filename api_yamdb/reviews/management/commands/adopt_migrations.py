@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+# приложения, таблицы которых в старых базах создавались без миграций
+# (migrate --run-syncdb) и совпадают со схемой их начальных миграций
+ADOPTED_MIGRATIONS = (
+    ("users", "0001_initial"),
+    ("reviews", "0001_initial"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Отмечает начальные миграции приложений users и reviews "
+        "примененными в базе, созданной до их появления; "
+        "после этого выполните migrate."
+    )
+
+    def handle(self, *args, **options):
+        loader = MigrationLoader(connection)
+        recorder = MigrationRecorder(connection)
+        tables = set(connection.introspection.table_names())
+        for key in ADOPTED_MIGRATIONS:
+            app_label, name = key
+            if key in loader.applied_migrations:
+                self.stdout.write(f"{app_label}.{name} уже применена")
+                continue
+            state = loader.project_state(key, at_end=True)
+            models = state.apps.get_app_config(app_label).get_models()
+            missing = sorted(
+                model._meta.db_table
+                for model in models
+                if model._meta.db_table not in tables
+            )
+            if missing:
+                self.stdout.write(
+                    f"{app_label}.{name} пропущена, нет таблиц: "
+                    f"{', '.join(missing)}"
+                )
+                continue
+            recorder.record_applied(app_label, name)
+            self.stdout.write(
+                self.style.SUCCESS(f"{app_label}.{name} отмечена примененной")
+            )
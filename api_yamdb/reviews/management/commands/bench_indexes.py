@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from reviews.benchmark import measure, seed
+from reviews.models import Comments, Review, Title
+
+# индексы из миграции 0002_indexes, которые сравниваются с их отсутствием
+INDEXES = (
+    "review_title_pub_date_idx",
+    "comment_review_pub_date_idx",
+    "title_year_idx",
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает планы и время запросов API с индексами и без них. "
+        "Индексы удаляются внутри транзакции, которая затем откатывается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Добавить столько синтетических произведений перед замером.",
+        )
+        parser.add_argument("--reviews-per-title", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed(options["seed"], options["reviews_per_title"])
+        review = Review.objects.order_by("-id").first()
+        if review is None:
+            self.stderr.write("Нет отзывов: запустите с --seed N")
+            return
+        title = Title.objects.get(pk=review.title_id)
+        queries = {
+            "отзывы произведения по pub_date": lambda: Review.objects.filter(
+                title_id=title.pk
+            ).order_by("pub_date", "id")[:7],
+            "отзыв автора на произведение": lambda: Review.objects.filter(
+                author_id=review.author_id, title_id=title.pk
+            ).values("id")[:1],
+            "комментарии к отзыву по pub_date": lambda: (
+                Comments.objects.filter(review_id=review.pk)
+                .order_by("pub_date", "id")[:7]
+            ),
+            "произведения по году": lambda: Title.objects.filter(
+                year=title.year
+            )[:7],
+            "произведения по slug категории": lambda: Title.objects.filter(
+                category__slug=title.category.slug
+            )[:7],
+        }
+        self.stdout.write(
+            f"Произведений: {Title.objects.count()}, "
+            f"отзывов: {Review.objects.count()}, "
+            f"комментариев: {Comments.objects.count()}"
+        )
+        # SQLite кэширует подготовленные запросы вместе с планом, поэтому
+        # каждый замер идёт на новом соединении
+        connection.close()
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for name in INDEXES:
+                        cursor.execute(
+                            f"DROP INDEX {connection.ops.quote_name(name)}"
+                        )
+                before = self.run(queries, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+        connection.close()
+        after = self.run(queries, options["repeat"])
+        for name in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, results in (("без индексов", before),
+                                   ("с индексами", after)):
+                plan, elapsed = results[name]
+                self.stdout.write(f"  {label}: {elapsed:.3f} мс")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def run(self, queries, repeat):
+        return {
+            name: (
+                build().explain(),
+                measure(lambda: list(build()), repeat),
+            )
+            for name, build in queries.items()
+        }
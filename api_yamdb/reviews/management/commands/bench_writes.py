@@ -0,0 +1,103 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+
+from reviews.benchmark import next_id, seed
+from users.models import User
+from users.tokens import access_token_for_user
+
+# PRAGMA поверх api_yamdb.sqlite3.DEFAULT_PRAGMAS для сравниваемых режимов
+MODES = {
+    "wal": {},
+    "rollback": {
+        "journal_mode": "delete",
+        "synchronous": "full",
+        "mmap_size": 0,
+        "cache_size": None,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает запись отзывов через API из нескольких потоков "
+        "в режимах SQLite WAL и rollback journal. Добавляет в базу "
+        "синтетические произведения, пользователей и отзывы."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--reviews", type=int, default=50,
+                            help="Отзывов на один поток.")
+        parser.add_argument(
+            "--mode", choices=tuple(MODES), action="append",
+            help="Режимы для сравнения, по умолчанию все.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Команда сравнивает режимы SQLite.")
+        options_dict = connections.databases["default"]["OPTIONS"]
+        configured = options_dict.get("PRAGMAS", {})
+        try:
+            for mode in options["mode"] or tuple(MODES):
+                options_dict["PRAGMAS"] = {**configured, **MODES[mode]}
+                # PRAGMA применяются при открытии соединения
+                connection.close()
+                self.run(mode, options["writers"], options["reviews"])
+        finally:
+            options_dict["PRAGMAS"] = configured
+            connection.close()
+
+    def run(self, mode, writers, reviews):
+        first_title, _ = seed(writers * reviews, reviews_per_title=0)
+        first_user = next_id(User)
+        users = User.objects.bulk_create(
+            User(
+                id=first_user + number,
+                username=f"writer_{first_user + number}",
+                email=f"writer_{first_user + number}@yamdb.fake",
+            )
+            for number in range(writers)
+        )
+        tokens = [str(access_token_for_user(user)) for user in users]
+
+        def writer(number):
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {tokens[number]}")
+            timings = []
+            errors = 0
+            try:
+                for offset in range(reviews):
+                    title_id = first_title + number * reviews + offset
+                    started = time.perf_counter()
+                    response = client.post(
+                        f"/api/v1/titles/{title_id}/reviews/",
+                        data={"text": "Отзыв", "score": 5},
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+                    errors += response.status_code != 201
+            finally:
+                connection.close()
+            return timings, errors
+
+        connection.close()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(writers) as executor:
+            results = list(executor.map(writer, range(writers)))
+        elapsed = time.perf_counter() - started
+        timings = sorted(timing for result in results for timing in result[0])
+        errors = sum(result[1] for result in results)
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(self.style.MIGRATE_HEADING(mode))
+        self.stdout.write(
+            f"  отзывов: {len(timings)}, ошибок: {errors}, "
+            f"{len(timings) / elapsed:.0f} отзывов/с"
+        )
+        self.stdout.write(
+            f"  p50 {percentiles[49]:.2f} мс, p95 {percentiles[94]:.2f} мс, "
+            f"p99 {percentiles[98]:.2f} мс"
+        )
@@ -0,0 +1,206 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import Category, Comments, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from .rebuild_ratings import rebuild_ratings
+
+
+def user_from_row(row):
+    return User(
+        id=row["id"],
+        username=row["username"],
+        email=row["email"],
+        role=row["role"] or User.USER,
+        bio=row["bio"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        password=make_password(None),
+    )
+
+
+def category_from_row(row):
+    return Category(id=row["id"], name=row["name"], slug=row["slug"])
+
+
+def genre_from_row(row):
+    return Genre(id=row["id"], name=row["name"], slug=row["slug"])
+
+
+def title_from_row(row):
+    return Title(
+        id=row["id"],
+        name=row["name"],
+        year=row["year"],
+        description=row.get("description") or None,
+        category_id=row["category"] or None,
+    )
+
+
+def genre_title_from_row(row):
+    return GenreTitle(
+        id=row["id"], title_id=row["title_id"], genre_id=row["genre_id"]
+    )
+
+
+def review_from_row(row):
+    return Review(
+        id=row["id"],
+        title_id=row["title_id"],
+        author_id=row["author"],
+        text=row["text"],
+        score=row["score"],
+        pub_date=parse_datetime(row["pub_date"]),
+    )
+
+
+def comment_from_row(row):
+    return Comments(
+        id=row["id"],
+        review_id=row["review_id"],
+        author_id=row["author"],
+        text=row["text"],
+        pub_date=parse_datetime(row["pub_date"]),
+    )
+
+
+# порядок загрузки учитывает зависимости по внешним ключам;
+# для каждого ключа указана колонка файла и модель, на которую он ссылается
+SOURCES = (
+    ("users.csv", User, user_from_row, {}),
+    ("category.csv", Category, category_from_row, {}),
+    ("genre.csv", Genre, genre_from_row, {}),
+    ("titles.csv", Title, title_from_row, {"category": Category}),
+    (
+        "genre_title.csv",
+        GenreTitle,
+        genre_title_from_row,
+        {"title_id": Title, "genre_id": Genre},
+    ),
+    (
+        "review.csv",
+        Review,
+        review_from_row,
+        {"title_id": Title, "author": User},
+    ),
+    (
+        "comments.csv",
+        Comments,
+        comment_from_row,
+        {"review_id": Review, "author": User},
+    ),
+)
+
+
+@contextmanager
+def keep_pub_date(model):
+    # auto_now_add перезаписал бы даты из файла при вставке
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает данные из CSV-файлов static/data в базу пачками "
+        "через bulk_create, по одной транзакции на файл."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=os.path.join(settings.BASE_DIR, "static", "data"),
+            help="Каталог с CSV-файлами.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Количество строк в одной пачке bulk_create.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size должен быть положительным.")
+        # идентификаторы уже загруженных записей: проверяем внешние ключи
+        # по ним, а не запросом к базе на каждую строку
+        known_ids = {}
+        for filename, model, from_row, references in SOURCES:
+            filepath = os.path.join(path, filename)
+            if not os.path.exists(filepath):
+                self.stdout.write(f"{filename}: файл не найден, пропущен")
+                continue
+            for target in references.values():
+                if target not in known_ids:
+                    known_ids[target] = set(
+                        target.objects.values_list("id", flat=True)
+                    )
+            started = time.monotonic()
+            with open(filepath, encoding="utf-8", newline="") as source:
+                rows = csv.DictReader(source)
+                with transaction.atomic(), keep_pub_date(model):
+                    loaded = self.load(
+                        rows, model, from_row, references, known_ids,
+                        chunk_size, filename,
+                    )
+                    self.reset_sequence(model)
+            elapsed = time.monotonic() - started
+            rate = loaded / elapsed if elapsed else loaded
+            self.stdout.write(
+                f"{filename}: {loaded} строк за {elapsed:.2f} с "
+                f"({rate:.0f} строк/с)"
+            )
+        if Review in known_ids:
+            rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS("Загрузка завершена"))
+
+    def load(self, rows, model, from_row, references, known_ids,
+             chunk_size, filename):
+        loaded = 0
+        ids = known_ids.setdefault(model, set())
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return loaded
+            objs = []
+            for number, row in enumerate(chunk, start=loaded + 1):
+                for column, target in references.items():
+                    value = row[column]
+                    if value and int(value) not in known_ids[target]:
+                        raise CommandError(
+                            f"{filename}, запись {number}: {column}={value} "
+                            f"не найден в {target._meta.verbose_name_plural}"
+                        )
+                objs.append(from_row(row))
+            # размер пачки INSERT Django подбирает под ограничения бэкенда
+            model.objects.bulk_create(objs)
+            ids.update(int(row["id"]) for row in chunk)
+            loaded += len(chunk)
+
+    def reset_sequence(self, model):
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
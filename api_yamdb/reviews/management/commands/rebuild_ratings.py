@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import HISTOGRAM_FIELDS, SCORES, Comments, Review, Title
+
+
+def rebuild_ratings():
+    # пересчитываем агрегаты UPDATE с коррелированными подзапросами:
+    # сначала комментарии к отзывам, затем отзывы произведений
+    comments = Comments.objects.filter(
+        review=OuterRef("pk")
+    ).values("review")
+    Review.objects.update(
+        comments_count=Coalesce(
+            Subquery(
+                comments.annotate(total=Count("pk")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    )
+    reviews = Review.objects.filter(title=OuterRef("pk")).values("title")
+    return Title.objects.update(
+        reviews_count=Coalesce(
+            Subquery(
+                reviews.annotate(total=Count("pk")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        score_sum=Coalesce(
+            Subquery(
+                reviews.annotate(total=Sum("score")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        **{
+            field: Coalesce(
+                Subquery(
+                    reviews.filter(score=score)
+                    .annotate(total=Count("pk")).values("total"),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+            for score, field in zip(SCORES, HISTOGRAM_FIELDS)
+        },
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает количество отзывов, сумму и гистограмму оценок "
+        "произведений и количество комментариев к отзывам."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитан рейтинг произведений: {updated}")
+        )
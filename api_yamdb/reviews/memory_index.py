@@ -0,0 +1,71 @@
+import threading
+import time
+
+from django.db import connection
+
+
+class ProcessIndex:
+    """Структура данных в памяти процесса, построенная по базе.
+
+    Загружается методом build() при первом обращении, после чего
+    обновляется сигналами моделей и перестраивается в фоне раз в max_age
+    секунд, чтобы подхватить изменения из других процессов. Обновления
+    до загрузки пропускаются: загрузка и так прочитает свежие данные.
+    """
+
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = None
+        self._reloading = False
+
+    @property
+    def loaded(self):
+        return self._snapshot is not None
+
+    def build(self):
+        raise NotImplementedError
+
+    def load(self):
+        snapshot = self.build()
+        with self._lock:
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+            self._reloading = False
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._snapshot = None
+            self._loaded_at = None
+
+    def ensure_loaded(self):
+        """Текущий снимок; загружает его, если индекс ещё не загружен.
+
+        Читать нужно возвращённый снимок: параллельный reset() может
+        обнулить _snapshot сразу после проверки.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+        with self._lock:
+            # после reset() _loaded_at уже None: снимок перестроит
+            # следующий вызов
+            stale = (
+                not self._reloading
+                and self._loaded_at is not None
+                and time.monotonic() - self._loaded_at > self.max_age
+            )
+            if stale:
+                self._reloading = True
+        if stale:
+            threading.Thread(target=self._reload, daemon=True).start()
+        return snapshot
+
+    def _reload(self):
+        try:
+            self.load()
+        finally:
+            self._reloading = False
+            connection.close()
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_reviews(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(title=OuterRef('pk')).values('title')
+    Title.objects.update(
+        reviews_count=Coalesce(
+            Subquery(
+                reviews.annotate(total=Count('pk')).values('total'),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        score_sum=Coalesce(
+            Subquery(
+                reviews.annotate(total=Sum('score')).values('total'),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия отзывов'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='comments_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия комментариев'),
+        ),
+        migrations.RunPython(count_reviews, migrations.RunPython.noop),
+    ]
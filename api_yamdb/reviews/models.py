@@ -1,7 +1,40 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 from users.models import User
 
+SCORES = range(1, 11)
+# гистограмма оценок: поле score_N хранит количество отзывов с оценкой N
+HISTOGRAM_FIELDS = tuple(f"score_{score}" for score in SCORES)
+
+
+class CounterFieldsMixin:
+    """Не перезаписывает при сохранении счётчики из counter_fields.
+
+    Счётчики меняются только через F() в reviews.signals, а значение в
+    загруженном объекте могло устареть.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            # отложенные поля only() тоже не трогаем: иначе save()
+            # догрузит их из базы по одному запросу на поле
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Category(models.Model):
     name = models.CharField(
@@ -41,7 +74,7 @@ class Genre(models.Model):
         verbose_name_plural = "Жанры"
 
 
-class Title(models.Model):
+class Title(CounterFieldsMixin, models.Model):
     name = models.TextField(
         "Название произведения",
     )
@@ -64,14 +97,104 @@ class Title(models.Model):
         null=True,
         verbose_name="Категория",
     )
+    # агрегаты по отзывам хранятся в самой записи и поддерживаются
+    # сигналами reviews.signals, чтобы не считать Avg() на каждый запрос
+    reviews_count = models.PositiveIntegerField(
+        "Количество отзывов",
+        default=0,
+        editable=False,
+    )
+    score_sum = models.PositiveIntegerField(
+        "Сумма оценок",
+        default=0,
+        editable=False,
+    )
+    # метка изменения отзывов произведения для условных GET-запросов
+    reviews_version = models.PositiveIntegerField(
+        "Версия отзывов",
+        default=0,
+        editable=False,
+    )
+    # количество отзывов по оценкам (HISTOGRAM_FIELDS) для stats и медианы
+    score_1 = models.PositiveIntegerField(
+        "Отзывов с оценкой 1",
+        default=0,
+        editable=False,
+    )
+    score_2 = models.PositiveIntegerField(
+        "Отзывов с оценкой 2",
+        default=0,
+        editable=False,
+    )
+    score_3 = models.PositiveIntegerField(
+        "Отзывов с оценкой 3",
+        default=0,
+        editable=False,
+    )
+    score_4 = models.PositiveIntegerField(
+        "Отзывов с оценкой 4",
+        default=0,
+        editable=False,
+    )
+    score_5 = models.PositiveIntegerField(
+        "Отзывов с оценкой 5",
+        default=0,
+        editable=False,
+    )
+    score_6 = models.PositiveIntegerField(
+        "Отзывов с оценкой 6",
+        default=0,
+        editable=False,
+    )
+    score_7 = models.PositiveIntegerField(
+        "Отзывов с оценкой 7",
+        default=0,
+        editable=False,
+    )
+    score_8 = models.PositiveIntegerField(
+        "Отзывов с оценкой 8",
+        default=0,
+        editable=False,
+    )
+    score_9 = models.PositiveIntegerField(
+        "Отзывов с оценкой 9",
+        default=0,
+        editable=False,
+    )
+    score_10 = models.PositiveIntegerField(
+        "Отзывов с оценкой 10",
+        default=0,
+        editable=False,
+    )
+
+    counter_fields = (
+        "reviews_count",
+        "score_sum",
+        "reviews_version",
+        *HISTOGRAM_FIELDS,
+    )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.reviews_count:
+            return None
+        return self.score_sum / self.reviews_count
+
+    @property
+    def histogram(self):
+        return [getattr(self, field) for field in HISTOGRAM_FIELDS]
+
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
         ordering = ["-id"]
+        indexes = [
+            # фильтр year в TitleFilter
+            models.Index(fields=["year"], name="title_year_idx"),
+        ]
 
 
 class GenreTitle(models.Model):
@@ -97,7 +220,7 @@ class GenreTitle(models.Model):
         verbose_name_plural = "Связи жанра и произведения"
 
 
-class Review(models.Model):
+class Review(CounterFieldsMixin, models.Model):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -120,10 +243,38 @@ class Review(models.Model):
         "Дата отзыва",
         auto_now_add=True,
     )
+    comments_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False,
+    )
+    # метка изменения комментариев к отзыву для условных GET-запросов
+    comments_version = models.PositiveIntegerField(
+        "Версия комментариев",
+        default=0,
+        editable=False,
+    )
+
+    counter_fields = ("comments_count", "comments_version")
 
     def __str__(self):
         return f"Ревью на {self.title}, автор {self.author}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding or kwargs.get("force_insert"):
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            # UPDATE без изменений блокирует строку отзыва до конца
+            # транзакции (в SQLite — всю базу на запись): параллельные
+            # изменения оценки идут по очереди, а review_saved поправляет
+            # агрегаты произведения на разницу с оценкой из базы
+            stored = Review.objects.filter(pk=self.pk)
+            stored.update(score=F("score"))
+            self._loaded_score = stored.values_list(
+                "score", flat=True
+            ).first()
+            super().save(*args, **kwargs)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -131,6 +282,16 @@ class Review(models.Model):
                 name="unique_title_author"
             )
         ]
+        # второй отзыв автора на произведение отсекает ограничение
+        # unique_title_author (ReviewsSerializer.create), поиск отзыва
+        # автора после ошибки вставки обслуживает его индекс
+        indexes = [
+            # отзывы произведения в порядке публикации, в т.ч. keyset
+            models.Index(
+                fields=["title", "pub_date", "id"],
+                name="review_title_pub_date_idx",
+            ),
+        ]
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
 
@@ -160,5 +321,12 @@ class Comments(models.Model):
         return f"Комментарий к отзыву {self.review}, автор {self.author}"
 
     class Meta:
+        indexes = [
+            # комментарии к отзыву в порядке публикации, в т.ч. keyset
+            models.Index(
+                fields=["review", "pub_date", "id"],
+                name="comment_review_pub_date_idx",
+            ),
+        ]
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
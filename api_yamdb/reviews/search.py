@@ -0,0 +1,99 @@
+import re
+
+from django.db import connection
+
+TITLE_TABLE = "reviews_title"
+FTS_TABLE = "reviews_title_fts"
+# вес совпадения в названии относительно описания для bm25
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# таблица FTS5 хранит только индекс, текст читается из reviews_title
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"name, description, content='{TITLE_TABLE}', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')"
+)
+REBUILD_FTS_SQL = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')"
+)
+DROP_FTS_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+# триггеры пересоздаются после каждой миграции: SQLite пересобирает
+# таблицу при изменении схемы и теряет её триггеры
+TRIGGERS_SQL = (
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert "
+    f"AFTER INSERT ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete "
+    f"AFTER DELETE ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+    f"AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+)
+DROP_TRIGGERS_SQL = tuple(
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{name}"
+    for name in ("insert", "delete", "update")
+)
+
+
+def ensure_fts_triggers(using_connection=connection):
+    if using_connection.vendor != "sqlite":
+        return
+    tables = using_connection.introspection.table_names()
+    if FTS_TABLE not in tables or TITLE_TABLE not in tables:
+        return
+    with using_connection.cursor() as cursor:
+        for sql in TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+def match_expression(value):
+    # каждое слово — префиксный поиск в кавычках, чтобы спецсимволы
+    # запроса не интерпретировались синтаксисом FTS5
+    words = re.findall(r"\w+", value)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_titles(queryset, value):
+    """Фильтрует произведения по полнотекстовому запросу с ранжированием."""
+    if connection.vendor == "sqlite":
+        expression = match_expression(value)
+        if not expression:
+            return queryset.none()
+        return queryset.extra(
+            select={
+                "search_rank": (
+                    f"bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})"
+                ),
+            },
+            tables=[FTS_TABLE],
+            where=[
+                f"{FTS_TABLE}.rowid = {TITLE_TABLE}.id",
+                f"{FTS_TABLE} MATCH %s",
+            ],
+            params=[expression],
+        ).order_by("search_rank", "-id")
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = (
+            SearchVector("name", weight="A")
+            + SearchVector("description", weight="B")
+        )
+        query = SearchQuery(value)
+        return queryset.annotate(
+            search_rank=SearchRank(vector, query),
+        ).filter(search_rank__gt=0).order_by("-search_rank", "-id")
+    return queryset.filter(name__icontains=value) | queryset.filter(
+        description__icontains=value
+    )
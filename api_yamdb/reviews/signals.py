@@ -0,0 +1,153 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from users.models import User
+
+from .leaderboard import title_leaderboard
+from .models import Category, Comments, Genre, Review, Title
+from .suggest import title_suggest_index
+
+# оценка произведения изменилась: old_score равен None для нового отзыва,
+# new_score — для удалённого; отправляется после обновления агрегатов
+score_changed = Signal(providing_args=["title_id", "old_score", "new_score"])
+
+
+def histogram_changes(old_score=None, new_score=None):
+    changes = {}
+    if old_score is not None:
+        field = f"score_{old_score}"
+        changes[field] = F(field) - 1
+    if new_score is not None:
+        field = f"score_{new_score}"
+        changes[field] = F(field) + 1
+    return changes
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    changes = {"reviews_version": F("reviews_version") + 1}
+    old_score = None
+    if created:
+        changes["reviews_count"] = F("reviews_count") + 1
+        changes["score_sum"] = F("score_sum") + instance.score
+        changes.update(histogram_changes(new_score=instance.score))
+    else:
+        old_score = getattr(instance, "_loaded_score", instance.score)
+        delta = instance.score - old_score
+        if delta:
+            changes["score_sum"] = F("score_sum") + delta
+            changes.update(histogram_changes(old_score, instance.score))
+    Title.objects.filter(pk=instance.title_id).update(**changes)
+    instance._loaded_score = instance.score
+    if old_score != instance.score:
+        score_changed.send(
+            sender=Review,
+            title_id=instance.title_id,
+            old_score=old_score,
+            new_score=instance.score,
+        )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id).update(
+        reviews_count=F("reviews_count") - 1,
+        score_sum=F("score_sum") - instance.score,
+        reviews_version=F("reviews_version") + 1,
+        **histogram_changes(old_score=instance.score),
+    )
+    score_changed.send(
+        sender=Review,
+        title_id=instance.title_id,
+        old_score=instance.score,
+        new_score=None,
+    )
+
+
+@receiver(post_save, sender=Comments)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    changes = {"comments_version": F("comments_version") + 1}
+    if created:
+        changes["comments_count"] = F("comments_count") + 1
+    Review.objects.filter(pk=instance.review_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comments)
+def comment_deleted(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=F("comments_count") - 1,
+        comments_version=F("comments_version") + 1,
+    )
+
+
+@receiver(post_save, sender=User)
+def author_renamed(sender, instance, created, raw=False, **kwargs):
+    if raw or created or not instance.username_changed:
+        return
+    Title.objects.filter(reviews__author=instance).update(
+        reviews_version=F("reviews_version") + 1
+    )
+    Review.objects.filter(comments__author=instance).update(
+        comments_version=F("comments_version") + 1
+    )
+
+
+# индекс подсказок обновляется только после фиксации транзакции, чтобы
+# откаченные изменения не попадали в память процесса
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(partial(
+        title_suggest_index.upsert, instance.pk, instance.name
+    ))
+    if not created:
+        transaction.on_commit(partial(
+            title_leaderboard.refresh, instance.pk
+        ))
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(title_suggest_index.remove, instance.pk))
+    transaction.on_commit(partial(title_leaderboard.remove, instance.pk))
+
+
+@receiver(score_changed)
+def indexes_score_changed(sender, title_id, old_score, new_score, **kwargs):
+    transaction.on_commit(partial(
+        title_suggest_index.change_score, title_id, old_score, new_score
+    ))
+    transaction.on_commit(partial(title_leaderboard.refresh, title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        transaction.on_commit(title_leaderboard.reset)
+    else:
+        transaction.on_commit(partial(
+            title_leaderboard.refresh, instance.pk
+        ))
+
+
+# slug раздела входит в ключи рейтингов, а удаление категории обнуляет
+# её у произведений без сигналов, поэтому рейтинги строятся заново
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def section_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(title_leaderboard.reset)
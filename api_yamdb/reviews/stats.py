@@ -0,0 +1,44 @@
+import math
+
+from .models import SCORES
+
+PERCENTILES = (25, 75, 90)
+
+
+def score_at_rank(histogram, rank):
+    # оценка отзыва с номером rank, если выстроить отзывы по возрастанию оценки
+    seen = 0
+    for score, amount in zip(SCORES, histogram):
+        seen += amount
+        if seen >= rank:
+            return score
+    return None
+
+
+def score_stats(histogram):
+    """Статистика оценок по гистограмме произведения за O(len(SCORES))."""
+    count = sum(histogram)
+    stats = {
+        "count": count,
+        "average": None,
+        "median": None,
+        "percentiles": {f"p{percent}": None for percent in PERCENTILES},
+        "histogram": dict(zip(SCORES, histogram)),
+    }
+    if not count:
+        return stats
+    stats["average"] = round(
+        sum(score * amount for score, amount in zip(SCORES, histogram))
+        / count,
+        2,
+    )
+    stats["median"] = (
+        score_at_rank(histogram, (count + 1) // 2)
+        + score_at_rank(histogram, count // 2 + 1)
+    ) / 2
+    for percent in PERCENTILES:
+        # метод ближайшего ранга
+        stats["percentiles"][f"p{percent}"] = score_at_rank(
+            histogram, math.ceil(count * percent / 100)
+        )
+    return stats
@@ -0,0 +1,149 @@
+import heapq
+import re
+from array import array
+
+from django.conf import settings
+
+from .memory_index import ProcessIndex
+
+WORD = re.compile(r"\w+")
+
+
+def fold(text):
+    return text.casefold().replace("ё", "е")
+
+
+def prefix_trigrams(word):
+    # слово дополняется слева, поэтому триграммы запроса из одной-двух
+    # букв тоже находятся: поиск идёт по началу слов
+    padded = "  " + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Snapshot:
+    """Массивы индекса: позиция (слот) произведения во всех массивах одна."""
+
+    def __init__(self):
+        self.slots = {}
+        self.ids = array("q")
+        self.names = []
+        self.words = []
+        self.counts = array("q")
+        self.sums = array("q")
+        self.postings = {}
+        self.removed = 0
+
+    def add(self, title_id, name, count, score_sum):
+        slot = len(self.ids)
+        words = tuple(WORD.findall(fold(name)))
+        self.slots[title_id] = slot
+        self.ids.append(title_id)
+        self.names.append(name)
+        self.words.append(words)
+        self.counts.append(count)
+        self.sums.append(score_sum)
+        for word in words:
+            for gram in prefix_trigrams(word):
+                self.postings.setdefault(gram, array("l")).append(slot)
+
+    def remove(self, title_id):
+        # слот помечается удалённым; место освобождается при перезагрузке
+        slot = self.slots.pop(title_id, None)
+        if slot is not None:
+            self.words[slot] = None
+            self.removed += 1
+        return slot
+
+
+class TitleSuggestIndex(ProcessIndex):
+    """Триграммный индекс названий произведений в памяти процесса.
+
+    Ищет произведения, в названии которых есть слова, начинающиеся со
+    слов запроса, и возвращает лучшие по рейтингу без обращения к базе.
+    """
+
+    def build(self):
+        from .models import Title
+
+        snapshot = Snapshot()
+        rows = Title.objects.values_list(
+            "id", "name", "reviews_count", "score_sum"
+        ).order_by("id").iterator(chunk_size=5000)
+        for row in rows:
+            snapshot.add(*row)
+        return snapshot
+
+    def upsert(self, title_id, name, count=0, score_sum=0):
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            slot = snapshot.slots.get(title_id)
+            if slot is not None:
+                if snapshot.names[slot] == name:
+                    return
+                count, score_sum = snapshot.counts[slot], snapshot.sums[slot]
+                snapshot.remove(title_id)
+            snapshot.add(title_id, name, count, score_sum)
+
+    def remove(self, title_id):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.remove(title_id)
+
+    def change_score(self, title_id, old_score, new_score):
+        with self._lock:
+            snapshot = self._snapshot
+            slot = snapshot and snapshot.slots.get(title_id)
+            if slot is None:
+                return
+            snapshot.counts[slot] += (
+                (new_score is not None) - (old_score is not None)
+            )
+            snapshot.sums[slot] += (new_score or 0) - (old_score or 0)
+
+    def suggest(self, query, limit=10):
+        words = WORD.findall(fold(query))
+        if not words:
+            return []
+        snapshot = self.ensure_loaded()
+        grams = set().union(*(prefix_trigrams(word) for word in words))
+        with self._lock:
+            postings = [snapshot.postings.get(gram) for gram in grams]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+            matches = [
+                slot for slot in candidates
+                if snapshot.words[slot] is not None
+                and all(
+                    any(name_word.startswith(word)
+                        for name_word in snapshot.words[slot])
+                    for word in words
+                )
+            ]
+
+            def rank(slot):
+                count = snapshot.counts[slot]
+                rating = snapshot.sums[slot] / count if count else -1
+                return rating, -snapshot.ids[slot]
+
+            result = []
+            for slot in heapq.nlargest(limit, matches, key=rank):
+                count = snapshot.counts[slot]
+                result.append({
+                    "id": snapshot.ids[slot],
+                    "name": snapshot.names[slot],
+                    "rating": (
+                        int(snapshot.sums[slot] / count) if count else None
+                    ),
+                })
+            return result
+
+
+title_suggest_index = TitleSuggestIndex(settings.SUGGEST_INDEX_MAX_AGE)
@@ -1,6 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import User
+from .models import OutboxMessage, User
 
 admin.site.register(User, UserAdmin)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        "id", "recipient", "subject", "status", "attempts", "created", "sent"
+    )
+    list_filter = ("status",)
+    search_fields = ("recipient",)
@@ -0,0 +1,48 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import deliver_pending
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Отправляет письма из очереди исходящих пачками."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Отправить накопившиеся письма и завершиться.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Количество писем в одной пачке.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = deliver_pending(options["batch_size"])
+            except Exception:
+                # ошибка (например, базы) не останавливает воркер:
+                # письма пачки вернутся в очередь по истечении резерва
+                logger.exception("Ошибка при отправке писем из очереди")
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(
+                    f"Отправлено: {sent}, ошибок: {failed}"
+                )
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -38,6 +39,47 @@ class User(AbstractUser):
         default=USER,
     )
 
+    # версия прав доступа: увеличивается при смене роли или флагов
+    # is_staff/is_superuser/is_active и отзывает выданные ранее токены
+    token_version = models.PositiveIntegerField(
+        "Версия токенов",
+        default=0,
+        editable=False,
+    )
+
+    ACCESS_FIELDS = ("role", "is_staff", "is_superuser", "is_active")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields().intersection(
+            cls.ACCESS_FIELDS
+        ):
+            instance._loaded_access = instance.access_state()
+        # имя автора входит в ответы отзывов и комментариев, и при его
+        # смене reviews.signals меняет их метки для условных GET-запросов
+        instance._loaded_username = instance.__dict__.get("username")
+        return instance
+
+    @property
+    def username_changed(self):
+        loaded = getattr(self, "_loaded_username", None)
+        return loaded is not None and loaded != self.username
+
+    def access_state(self):
+        return tuple(getattr(self, field) for field in self.ACCESS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_access", None)
+        if loaded is not None and loaded != self.access_state():
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_access = self.access_state()
+        self._loaded_username = self.username
+
     @property
     def is_admin(self):
         return self.role == User.ADMIN
@@ -54,3 +96,69 @@ class User(AbstractUser):
         verbose_name = "Пользователь"
         verbose_name_plural = "Пользователи"
         ordering = ("username",)
+
+
+class OutboxMessage(models.Model):
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (PENDING, "ожидает отправки"),
+        (SENT, "отправлено"),
+        (FAILED, "не отправлено"),
+    )
+
+    recipient = models.EmailField(
+        "Адрес получателя",
+        max_length=254,
+    )
+    subject = models.CharField(
+        "Тема",
+        max_length=255,
+    )
+    body = models.TextField(
+        "Текст письма",
+    )
+    status = models.CharField(
+        "Статус",
+        choices=STATUS_CHOICES,
+        max_length=15,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        "Количество попыток",
+        default=0,
+    )
+    last_error = models.TextField(
+        "Последняя ошибка",
+        blank=True,
+    )
+    created = models.DateTimeField(
+        "Дата создания",
+        auto_now_add=True,
+    )
+    next_attempt = models.DateTimeField(
+        "Дата следующей попытки",
+        default=timezone.now,
+    )
+    sent = models.DateTimeField(
+        "Дата отправки",
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.subject} для {self.recipient}: {self.status}"
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        ordering = ("-id",)
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt"],
+                name="outbox_status_next_idx",
+            ),
+        ]
@@ -0,0 +1,129 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# время, на которое воркер резервирует пачку писем за собой
+LEASE = timedelta(minutes=5)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox")
+_scheduled = threading.Event()
+
+
+def enqueue(subject, body, recipient):
+    """Сохраняет письмо в очередь; отправка идёт вне запроса."""
+    message = OutboxMessage.objects.create(
+        subject=subject,
+        body=body,
+        recipient=recipient,
+    )
+    if settings.OUTBOX_DELIVERY == "thread":
+        transaction.on_commit(schedule_delivery)
+    return message
+
+
+def schedule_delivery():
+    # пока отправка уже запланирована, новые письма попадут в ту же пачку
+    if not _scheduled.is_set():
+        _scheduled.set()
+        _executor.submit(_deliver_in_background)
+
+
+def _deliver_in_background():
+    _scheduled.clear()
+    try:
+        while deliver_pending() != (0, 0):
+            pass
+    except Exception:
+        logger.exception("Ошибка при отправке писем из очереди")
+    finally:
+        connections.close_all()
+
+
+def _claim(batch_size):
+    now = timezone.now()
+    ids = list(
+        OutboxMessage.objects.filter(
+            status=OutboxMessage.PENDING,
+            next_attempt__lte=now,
+        ).order_by("id").values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    lease_until = now + LEASE
+    OutboxMessage.objects.filter(
+        pk__in=ids,
+        status=OutboxMessage.PENDING,
+        next_attempt__lte=now,
+    ).update(next_attempt=lease_until)
+    return list(
+        OutboxMessage.objects.filter(pk__in=ids, next_attempt=lease_until)
+    )
+
+
+def _send(messages):
+    sent, failed = [], []
+    try:
+        with get_connection() as connection:
+            for message in messages:
+                try:
+                    EmailMessage(
+                        subject=message.subject,
+                        body=message.body,
+                        to=[message.recipient],
+                        connection=connection,
+                    ).send()
+                except Exception as error:
+                    message.last_error = repr(error)
+                    failed.append(message)
+                else:
+                    sent.append(message.pk)
+    except Exception as error:
+        # соединение с бэкендом не открылось или упало при закрытии:
+        # ещё не обработанные письма пачки считаются неотправленными
+        handled = {*sent, *(message.pk for message in failed)}
+        for message in messages:
+            if message.pk not in handled:
+                message.last_error = repr(error)
+                failed.append(message)
+    return sent, failed
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет пачку писем через одно соединение почтового бэкенда.
+
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    messages = _claim(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return 0, 0
+    sent, failed = _send(messages)
+    now = timezone.now()
+    OutboxMessage.objects.filter(pk__in=sent).update(
+        status=OutboxMessage.SENT,
+        sent=now,
+        attempts=F("attempts") + 1,
+        last_error="",
+    )
+    for message in failed:
+        message.attempts += 1
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = OutboxMessage.FAILED
+        # экспоненциальная задержка перед повторной попыткой
+        message.next_attempt = now + timedelta(
+            seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (message.attempts - 1)
+        )
+        message.save(
+            update_fields=("attempts", "status", "next_attempt", "last_error")
+        )
+    return len(sent), len(failed)
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+from .models import User
+from .tokens import MISSING_VERSION, publish_token_version
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, **kwargs):
+    publish_token_version(instance.pk, instance.token_version)
+    user_cache.delete(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    publish_token_version(instance.pk, MISSING_VERSION)
+    user_cache.delete(instance.pk)
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import User
+
+# поля пользователя, которые кладутся в access-токен
+CLAIM_FIELDS = ("username", "role", "is_staff", "is_superuser")
+VERSION_CLAIM = "ver"
+# версия для удалённого пользователя: не совпадёт ни с одним токеном
+MISSING_VERSION = -1
+
+
+def token_version_key(user_id):
+    return f"users:token_version:{user_id}"
+
+
+def publish_token_version(user_id, version):
+    # кэш может быть локальным для процесса: срок жизни записи ограничен,
+    # чтобы другие процессы увидели новую версию из базы
+    cache.set(token_version_key(user_id), version, settings.USER_CACHE_TTL)
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя: из кэша, при промахе из базы."""
+    version = cache.get(token_version_key(user_id))
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list(
+            "token_version", flat=True
+        ).first()
+        if version is None:
+            version = MISSING_VERSION
+        publish_token_version(user_id, version)
+    return version
+
+
+def access_token_for_user(user):
+    token = AccessToken.for_user(user)
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def user_from_claims(token):
+    """Пользователь, собранный из claims токена, без запроса к базе.
+
+    Объект содержит только id, username, роль и флаги доступа и не
+    предназначен для сохранения.
+    """
+    user = User(
+        id=token[api_settings.USER_ID_CLAIM],
+        token_version=token[VERSION_CLAIM],
+        **{field: token[field] for field in CLAIM_FIELDS},
+    )
+    user._state.adding = False
+    return user
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,3 +35,25 @@ assert get_version() < '3.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def outbox_worker_delivery(settings):
+    # в тестах письма отправляются явно, без фонового потока
+    settings.OUTBOX_DELIVERY = 'worker'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # база очищается между тестами без сигналов, поэтому сбрасываем
+    # закэшированные ответы, версии токенов, индекс подсказок и рейтинги
+    from django.core.cache import cache
+
+    from api.cache import response_stats
+    from reviews.leaderboard import title_leaderboard
+    from reviews.suggest import title_suggest_index
+
+    cache.clear()
+    response_stats.reset()
+    title_suggest_index.reset()
+    title_leaderboard.reset()
@@ -1,6 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
 
+from api.serializers import UniqueUserMixin
+
 User = get_user_model()
 
 
@@ -219,3 +221,31 @@ class Test00UserRegistration:
             f'Проверьте, что при {request_type} запросе `{self.url_signup}` нельзя создать '
             f'пользователя, username которого уже зарегистрирован и возвращается статус {code}'
         )
+        assert response.json() == {'username': ['This field must be unique.']}, (
+            f'Проверьте, что при {request_type} запросе `{self.url_signup}` с занятым '
+            f'username ошибка возвращается для поля `username`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_00_registration_concurrent_duplicate(self, client, monkeypatch):
+        User.objects.create_user(username='racer', email='racer@yamdb.fake')
+        # имитируем параллельную регистрацию: проверка перед вставкой
+        # не видит конфликтующую запись, срабатывает ограничение базы
+        get_unique_errors = UniqueUserMixin.get_unique_errors
+        calls = []
+
+        def first_check_misses(self, data):
+            calls.append(data)
+            if len(calls) == 1:
+                return {}
+            return get_unique_errors(self, data)
+
+        monkeypatch.setattr(UniqueUserMixin, 'get_unique_errors', first_check_misses)
+        response = client.post(
+            self.url_signup, data={'username': 'racer', 'email': 'other@yamdb.fake'}
+        )
+        assert response.status_code == 400, (
+            f'Проверьте, что при нарушении уникальности на уровне базы '
+            f'запрос `{self.url_signup}` возвращает статус 400'
+        )
+        assert response.json() == {'username': ['This field must be unique.']}
@@ -1,4 +1,7 @@
 import pytest
+from django.db import IntegrityError
+
+from api import serializers
 
 from .common import (auth_client, create_reviews, create_titles,
                      create_users_api)
@@ -334,3 +337,25 @@ class Test05ReviewAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', reviews, titles)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_review_integrity_errors(self, admin_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+
+        def fail(save, *args):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(serializers, 'save_in_savepoint', fail)
+        with pytest.raises(IntegrityError):
+            # ошибка не из-за повторного отзыва не выдаётся за ошибку 400
+            admin_client.post(url, data=data)
+        monkeypatch.undo()
+
+        assert admin_client.post(url, data=data).status_code == 201
+        response = admin_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв автора на произведение '
+            'возвращает статус 400'
+        )
@@ -0,0 +1,166 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments, create_reviews, create_titles
+
+
+def count_post_queries(client, url, data, code=200):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data)
+    assert response.status_code == code, (
+        f'Проверьте, что при POST запросе `{url}` возвращается статус {code}'
+    )
+    return len(context.captured_queries)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    return len(context.captured_queries)
+
+
+class Test08TitleQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_queries(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        queries_small = count_queries(client, '/api/v1/titles/')
+        assert queries_small == 3, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` жанры и категории '
+            'загружаются через select_related и prefetch_related'
+        )
+        for i in range(5):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {i}', 'year': 2000,
+                'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[0]['slug'],
+            })
+        assert count_queries(client, '/api/v1/titles/') == queries_small, (
+            'Проверьте, что количество запросов к базе при GET запросе '
+            '`/api/v1/titles/` не зависит от количества произведений на странице'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert count_queries(client, f'/api/v1/titles/{titles[0]["id"]}/') == 2, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` '
+            'жанры и категория загружаются без дополнительных запросов'
+        )
+
+
+class Test08AuthQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queries(self, client):
+        data = {'email': 'queries@yamdb.fake', 'username': 'queries'}
+        # одна проверка уникальности username и email, вставка пользователя
+        # и вставка письма в очередь
+        assert count_post_queries(client, '/api/v1/auth/signup/', data) == 3, (
+            'Проверьте, что при регистрации пользователь не запрашивается '
+            'из базы повторно после сохранения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_token_queries(self, client, user):
+        data = {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        }
+        assert count_post_queries(client, '/api/v1/auth/token/', data) == 1, (
+            'Проверьте, что при получении токена пользователь запрашивается '
+            'из базы один раз'
+        )
+
+
+class Test08ReviewQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_list_queries(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # метка и количество отзывов из записи произведения и сама страница
+        assert count_queries(client, url) == 2, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/` '
+            'произведение не запрашивается из базы повторно'
+        )
+        assert client.get('/api/v1/titles/0/reviews/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_create_queries(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        # пользователь, произведение, вставка отзыва и обновление счётчиков
+        assert count_post_queries(admin_client, url, data, code=201) == 4, (
+            'Проверьте, что при создании отзыва произведение запрашивается '
+            'из базы один раз, а повторный отзыв отсекает ограничение базы'
+        )
+        response = admin_client.post(url, data=data)
+        assert response.status_code == 400
+        assert response.json() == {
+            'non_field_errors': [
+                'Нельзя публиковать более 1 отзыва на произведение'
+            ]
+        }
+
+    @pytest.mark.parametrize('rows_list', (False, True))
+    @pytest.mark.django_db(transaction=True)
+    def test_03_nested_lists_queries(self, client, admin_client, admin,
+                                     django_user_model, settings, rows_list):
+        settings.API_ROWS_LIST = rows_list
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{title_url}{reviews[0]["id"]}/comments/'
+        for i in range(20):
+            author = auth_client(django_user_model.objects.create_user(
+                username=f'author{i}', email=f'author{i}@yamdb.fake'
+            ))
+            author.post(title_url, data={'text': 'Отзыв', 'score': 5})
+            author.post(comments_url, data={'text': 'Комментарий'})
+        for page_size in (1, 7, 23):
+            assert count_queries(
+                client, f'{title_url}?page_size={page_size}'
+            ) == 2, (
+                'Проверьте, что автор отзыва загружается тем же запросом, '
+                'что и отзывы, при любом размере страницы'
+            )
+            assert count_queries(
+                client, f'{comments_url}?page_size={page_size}'
+            ) == 2, (
+                'Проверьте, что автор комментария загружается тем же '
+                'запросом, что и комментарии, при любом размере страницы'
+            )
+        assert count_queries(client, f'{title_url}{reviews[0]["id"]}/') == 2
+        assert count_queries(
+            client, f'{comments_url}{comments[0]["id"]}/'
+        ) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_comment_create_queries(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        # пользователь, проверка пары произведение/отзыв, вставка
+        # комментария и обновление счётчиков отзыва
+        assert count_post_queries(
+            admin_client, url, {'text': 'Комментарий'}, code=201
+        ) == 4, (
+            'Проверьте, что при создании комментария отзыв проверяется '
+            'одним запросом'
+        )
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        assert admin_client.post(
+            wrong_url, data={'text': 'Комментарий'}
+        ).status_code == 404
+        assert admin_client.get(wrong_url).status_code == 404
@@ -0,0 +1,226 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review
+
+from .common import auth_client, create_comments, create_reviews, create_titles
+
+
+class Test09KeysetPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, client, admin_client, admin, django_user_model):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        for i in range(8):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{i}', email=f'reviewer{i}@yamdb.fake'
+            )
+            auth_client(author).post(
+                f'/api/v1/titles/{title_id}/reviews/',
+                data={'text': f'text {i}', 'score': 5}
+            )
+        url = f'/api/v1/titles/{title_id}/reviews/?pagination=cursor'
+        collected = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/` '
+                'с параметром `pagination=cursor` возвращается статус 200'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в keyset-режиме пагинации не считается `count`'
+            )
+            collected.extend(review['id'] for review in data['results'])
+            url = data['next']
+        assert len(collected) == 11 and len(set(collected)) == 11, (
+            'Проверьте, что при обходе отзывов по курсору каждый отзыв '
+            'возвращается ровно один раз'
+        )
+        assert collected == sorted(collected), (
+            'Проверьте, что в keyset-режиме отзывы упорядочены по `(pub_date, id)`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?pagination=cursor')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?pagination=cursor` '
+            'возвращается статус 200'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == sorted(
+            (title['id'] for title in titles), reverse=True
+        ), (
+            'Проверьте, что в keyset-режиме произведения упорядочены по `-id`'
+        )
+        assert data['next'] is None and data['previous'] is None
+
+        response = client.get('/api/v1/titles/')
+        assert 'count' in response.json(), (
+            'Проверьте, что без параметра `pagination=cursor` используется '
+            'постраничная пагинация'
+        )
+
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_tied_pub_date_cursor(self, client, admin_client, admin,
+                                     django_user_model):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        for i in range(9):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{i}', email=f'reviewer{i}@yamdb.fake'
+            )
+            auth_client(author).post(
+                f'/api/v1/titles/{title_id}/reviews/',
+                data={'text': f'text {i}', 'score': 5}
+            )
+        # как после load_csv: у всех отзывов одна дата публикации
+        Review.objects.update(pub_date=timezone.now())
+        url = (
+            f'/api/v1/titles/{title_id}/reviews/'
+            '?pagination=cursor&page_size=2'
+        )
+        collected = []
+        previous = None
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                data = client.get(url).json()
+                collected.extend(review['id'] for review in data['results'])
+                previous = data['previous']
+                url = data['next']
+        assert collected == sorted(collected) and len(collected) == 12, (
+            'Проверьте, что при одинаковой `pub_date` обход по курсору '
+            'возвращает отзывы по `id` ровно один раз'
+        )
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if 'OFFSET' in query['sql']
+        ], (
+            'Проверьте, что курсор хранит `(pub_date, id)` и страницы '
+            'выбираются без OFFSET'
+        )
+
+        backwards = []
+        url = previous
+        while url:
+            data = client.get(url).json()
+            backwards[:0] = [review['id'] for review in data['results']]
+            url = data['previous']
+        assert backwards == collected[:-2], (
+            'Проверьте, что ссылки `previous` возвращают предыдущие страницы'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title_id}/reviews/?cursor=broken'
+        )
+        assert response.status_code == 404
+
+def count_statements(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+    )
+    counts = [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    return response.json(), len(counts)
+
+
+class Test09PageCount:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stored_counts(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, counts = count_statements(client, url)
+        assert data['count'] == 3 and counts == 0, (
+            'Проверьте, что количество отзывов берётся из счётчика произведения'
+        )
+        data, counts = count_statements(
+            client, f'{url}{reviews[0]["id"]}/comments/'
+        )
+        assert data['count'] == 3 and counts == 0, (
+            'Проверьте, что количество комментариев берётся из счётчика отзыва'
+        )
+        admin_client.delete(f'{url}{reviews[0]["id"]}/comments/{comments[0]["id"]}/')
+        data, _ = count_statements(client, f'{url}{reviews[0]["id"]}/comments/')
+        assert data['count'] == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cached_title_count(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        for i in range(8):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {i}', 'year': 2000,
+                'genre': [genres[0]['slug']], 'category': categories[0]['slug'],
+            })
+        url = f'/api/v1/titles/?genre={genres[0]["slug"]}'
+        data, counts = count_statements(client, url)
+        assert data['count'] == 9 and counts == 1
+        data, counts = count_statements(client, f'{url}&page=2')
+        assert data['count'] == 9 and counts == 0, (
+            'Проверьте, что количество произведений с тем же фильтром '
+            'берётся из кэша для следующих страниц'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        data, counts = count_statements(client, f'{url}&page=2')
+        assert data['count'] == 8 and counts == 1, (
+            'Проверьте, что количество пересчитывается после изменения данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_without_count(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        for i in range(6):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {i}', 'year': 2000,
+                'genre': [genres[0]['slug']], 'category': categories[0]['slug'],
+            })
+        data, counts = count_statements(client, '/api/v1/titles/?count=false')
+        assert 'count' not in data and counts == 0, (
+            'Проверьте, что с параметром `count=false` количество не считается'
+        )
+        assert len(data['results']) == 7 and data['previous'] is None
+        assert 'page=2' in data['next']
+        data, _ = count_statements(client, data['next'])
+        assert len(data['results']) == 1 and data['next'] is None
+        assert data['previous'] is not None
+        assert client.get('/api/v1/titles/?count=false&page=3').status_code == 404
+
+
+class Test09PageSize:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_page_size(self, client, admin_client, settings):
+        settings.API_MAX_PAGE_SIZE = 10
+        _, categories, genres = create_titles(admin_client)
+        for i in range(12):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {i}', 'year': 2000,
+                'genre': [genres[0]['slug'], genres[1]['slug']],
+                'category': categories[0]['slug'],
+            })
+        with CaptureQueriesContext(connection) as context:
+            data = client.get('/api/v1/titles/?page_size=9').json()
+        assert len(data['results']) == 9 and data['count'] == 14, (
+            'Проверьте, что размер страницы задаётся параметром `page_size`'
+        )
+        assert len(context.captured_queries) == 3, (
+            'Проверьте, что число запросов не зависит от размера страницы'
+        )
+        data = client.get('/api/v1/titles/?page_size=1000').json()
+        assert len(data['results']) == 10, (
+            'Проверьте, что размер страницы ограничен `API_MAX_PAGE_SIZE`'
+        )
+        data = client.get(
+            '/api/v1/titles/?pagination=cursor&page_size=1000'
+        ).json()
+        assert len(data['results']) == 10
+        assert len(client.get('/api/v1/titles/').json()['results']) == 7
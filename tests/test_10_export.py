@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from .common import create_comments
+
+
+class Test10ExportAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_permissions(self, client, user_client):
+        response = client.get('/api/v1/export/reviews/')
+        assert response.status_code == 401, (
+            'Проверьте, что при GET запросе `/api/v1/export/{table}/` '
+            'без токена авторизации возвращается статус 401'
+        )
+        response = user_client.get('/api/v1/export/reviews/')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_ndjson_and_csv(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = admin_client.get(
+            f'/api/v1/export/reviews/?title={titles[0]["id"]}'
+        )
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся через StreamingHttpResponse'
+        )
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).decode().splitlines()
+        ]
+        assert [row['id'] for row in rows] == [review['id'] for review in reviews]
+        assert rows[0]['author'] == admin.username
+
+        response = admin_client.get('/api/v1/export/comments/?output=csv')
+        assert response.status_code == 200
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,title_id,review_id,author,text,pub_date'
+        assert len(lines) == len(comments) + 1
+
+        response = admin_client.get('/api/v1/export/users/')
+        assert response.status_code == 400, (
+            'Проверьте, что при выгрузке неизвестной таблицы возвращается статус 400'
+        )
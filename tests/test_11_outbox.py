@@ -0,0 +1,98 @@
+from io import StringIO
+
+import pytest
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import OperationalError
+from django.utils import timezone
+
+from users.management.commands import send_outbox
+from users.models import OutboxMessage
+from users.outbox import deliver_pending
+
+
+class Test11Outbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_message(self, client, mailoutbox):
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox_user'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mailoutbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется в запросе'
+        )
+        message = OutboxMessage.objects.get(recipient=data['email'])
+        assert message.status == OutboxMessage.PENDING
+
+        assert deliver_pending() == (1, 0)
+        assert len(mailoutbox) == 1
+        assert mailoutbox[0].to == [data['email']]
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.SENT
+        assert message.attempts == 1
+        assert deliver_pending() == (0, 0)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_delivery_is_retried(self, monkeypatch, settings, mailoutbox):
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        settings.OUTBOX_RETRY_DELAY = 0
+        message = OutboxMessage.objects.create(
+            recipient='retry@yamdb.fake', subject='Тема', body='Текст'
+        )
+
+        def fail(self):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailMessage, 'send', fail)
+        assert deliver_pending() == (0, 1)
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.PENDING
+        assert 'SMTP' in message.last_error
+
+        assert deliver_pending() == (0, 1)
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается как неотправленное'
+        )
+        assert deliver_pending() == (0, 0)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_connection_failure_is_retried(self, settings):
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        # на порту 1 никто не слушает: соединение отклоняется при открытии
+        settings.EMAIL_PORT = 1
+        message = OutboxMessage.objects.create(
+            recipient='refused@yamdb.fake', subject='Тема', body='Текст'
+        )
+        assert deliver_pending() == (0, 1), (
+            'Проверьте, что ошибка открытия соединения с почтовым сервером '
+            'помечает пачку неотправленной'
+        )
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.PENDING
+        assert message.attempts == 1
+        assert 'ConnectionRefusedError' in message.last_error
+        assert message.next_attempt > timezone.now()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_worker_survives_errors(self, monkeypatch):
+        def fail(batch_size=None):
+            raise OperationalError('database is locked')
+
+        monkeypatch.setattr(send_outbox, 'deliver_pending', fail)
+        call_command('send_outbox', '--once', stdout=StringIO())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_outbox_status_view(self, admin_client, user_client):
+        OutboxMessage.objects.create(
+            recipient='status@yamdb.fake', subject='Тема', body='Текст'
+        )
+        response = user_client.get('/api/v1/outbox/')
+        assert response.status_code == 403
+        response = admin_client.get('/api/v1/outbox/?status=pending')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 1
+        assert data['results'][0]['status'] == OutboxMessage.PENDING
@@ -0,0 +1,139 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import (CachedJWTAuthentication,
+                                StatelessJWTAuthentication)
+from api.views import ReviewsViewSet
+from users.cache import user_cache
+from users.models import User
+
+from .common import create_titles
+
+
+def obtain_token(user):
+    response = APIClient().post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == 200
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+    return client
+
+
+def users_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'users_user' in query['sql']
+    ]
+
+
+class Test12StatelessAuthentication:
+
+    @pytest.fixture(autouse=True)
+    def stateless(self, monkeypatch):
+        monkeypatch.setattr(
+            ReviewsViewSet, 'authentication_classes', (StatelessJWTAuthentication,)
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_queries(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client = obtain_token(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+        assert users_queries(context) == [], (
+            'Проверьте, что при аутентификации по claims токена '
+            'пользователь не запрашивается из базы'
+        )
+        review_id = response.json()['id']
+        response = client.patch(f'{url}{review_id}/', data={'score': 8})
+        assert response.status_code == 200, (
+            'Проверьте, что автор, аутентифицированный по claims токена, '
+            'может изменить свой отзыв'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change_revokes_token(self, admin_client, moderator):
+        titles, _, _ = create_titles(admin_client)
+        client = obtain_token(moderator)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(url).status_code == 200
+
+        response = admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == 200
+        assert client.get(url).status_code == 401, (
+            'Проверьте, что после смены роли выданный ранее токен отзывается'
+        )
+        assert obtain_token(moderator).get(url).status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cached_version_expires(self, admin_client, moderator,
+                                       settings):
+        titles, _, _ = create_titles(admin_client)
+        settings.USER_CACHE_TTL = 0
+        cache.clear()
+        client = obtain_token(moderator)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(url).status_code == 200
+
+        # версию поменял другой процесс: локальный кэш не сброшен
+        User.objects.filter(pk=moderator.pk).update(
+            token_version=F('token_version') + 1
+        )
+        response = client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 401, (
+            'Проверьте, что версия токенов хранится в кэше ограниченное '
+            'время (USER_CACHE_TTL)'
+        )
+
+
+class Test12CachedAuthentication:
+
+    @pytest.fixture(autouse=True)
+    def cached(self, monkeypatch):
+        monkeypatch.setattr(
+            ReviewsViewSet, 'authentication_classes', (CachedJWTAuthentication,)
+        )
+        user_cache.clear()
+        yield
+        user_cache.clear()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cache_hit(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert user_client.get(url).status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            assert user_client.get(url).status_code == 200
+        assert users_queries(context) == [], (
+            'Проверьте, что повторный запрос берёт пользователя из кэша'
+        )
+        stats = admin_client.get('/api/v1/stats/cache/').json()['users']
+        assert stats['hits'] == 1 and stats['misses'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_demotion_invalidates(self, admin_client, admin, moderator, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        review_url = f'{url}{response.json()["id"]}/'
+        assert moderator_client.patch(review_url, data={'score': 6}).status_code == 200
+
+        response = admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == 200
+        assert moderator_client.patch(review_url, data={'score': 7}).status_code == 403, (
+            'Проверьте, что после понижения роли кэш пользователя сбрасывается'
+        )
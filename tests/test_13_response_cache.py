@@ -0,0 +1,178 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api import signals
+from reviews.models import Genre, Title
+
+from .common import auth_client, create_comments, create_genre, create_titles
+
+
+class Test13ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genres_cached_and_invalidated(self, client, admin_client):
+        create_genre(admin_client)
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS'
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET запрос `/api/v1/genres/` '
+            'отдаётся из кэша'
+        )
+        assert response.json()['count'] == 3
+        assert client.get('/api/v1/genres/?search=Драма')['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает строку запроса'
+        )
+
+        admin_client.post('/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'})
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 4, (
+            'Проверьте, что кэш `/api/v1/genres/` сбрасывается при создании жанра'
+        )
+        admin_client.delete('/api/v1/genres/musical/')
+        assert client.get('/api/v1/genres/').json()['count'] == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_invalidated_by_related_models(self, client, admin_client, user):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        auth_client(user).post(f'{url}reviews/', data={'text': 'Отзыв', 'score': 8})
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что кэш произведения сбрасывается при создании отзыва'
+        )
+
+        admin_client.patch(url, data={'genre': [genres[2]['slug']]})
+        assert client.get(url).json()['genre'] == [
+            {'name': genres[2]['name'], 'slug': genres[2]['slug']}
+        ], (
+            'Проверьте, что кэш произведения сбрасывается при смене жанров'
+        )
+
+        stats = admin_client.get('/api/v1/stats/cache/').json()['responses']
+        assert stats['hits'] == 1
+        assert 0 < stats['hit_ratio'] < 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_bumped_after_rating_update(self, admin_client, user,
+                                                   monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        bumped = []
+
+        def bump(*namespaces):
+            title = Title.objects.get(pk=titles[0]['id'])
+            bumped.append((namespaces, title.reviews_count))
+
+        monkeypatch.setattr(signals, 'bump', bump)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 8},
+        )
+        assert bumped == [(('titles',), 1)], (
+            'Проверьте, что кэш произведений сбрасывается после '
+            'обновления рейтинга'
+        )
+
+        bumped.clear()
+        with transaction.atomic():
+            Genre.objects.create(name='Мюзикл', slug='musical')
+            assert bumped == [], (
+                'Проверьте, что кэш сбрасывается после фиксации транзакции'
+            )
+        assert bumped == [(('genres', 'titles'), 1)]
+
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_key_includes_host_and_scheme(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?page_size=1'
+        response = client.get(url, HTTP_HOST='one.example')
+        assert response.json()['next'].startswith('http://one.example/')
+        assert client.get(url, HTTP_HOST='one.example')['X-Cache'] == 'HIT'
+
+        response = client.get(url, HTTP_HOST='two.example')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['next'].startswith('http://two.example/'), (
+            'Проверьте, что ключ кэша учитывает хост: ссылки `next` '
+            'строятся по адресу запроса'
+        )
+        response = client.get(url, HTTP_HOST='one.example', secure=True)
+        assert response.json()['next'].startswith('https://one.example/'), (
+            'Проверьте, что ключ кэша учитывает схему запроса'
+        )
+
+class Test13ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_not_modified(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            'Проверьте, что ответ `/api/v1/titles/{title_id}/reviews/` содержит ETag'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается статус 304'
+        )
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что для ответа 304 отзывы не запрашиваются из базы'
+        )
+
+        auth_client(user).patch(f'{url}{reviews[1]["id"]}/', data={'text': 'Новый текст'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag меняется при изменении отзыва'
+        )
+
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        etag = client.get(comments_url)['ETag']
+        assert client.get(comments_url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.post(comments_url, data={'text': 'Ещё комментарий'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag комментариев меняется при добавлении комментария'
+        )
+        assert response.json()['count'] == len(comments) + 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_not_modified(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.patch(url, data={'name': 'Новое название'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert client.get('/api/v1/titles/999/reviews/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_author_rename_changes_etag(self, client, admin_client, admin):
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        reviews_etag = client.get(url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+
+        response = auth_client(user).patch(
+            '/api/v1/users/me/', data={'username': 'renamed'}
+        )
+        assert response.status_code == 200
+        response = client.get(url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag отзывов меняется при смене имени автора'
+        )
+        assert 'renamed' in [review['author'] for review in response.json()['results']]
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag комментариев меняется при смене имени автора'
+        )
+
+        etag = client.get(url)['ETag']
+        auth_client(user).patch('/api/v1/users/me/', data={'bio': 'Биография'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
@@ -0,0 +1,38 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test14TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Драма в трёх актах', 'year': 1999,
+            'genre': [genres[2]['slug']], 'category': categories[1]['slug'],
+            'description': 'Пьеса',
+        })
+        response = client.get('/api/v1/titles/?search=драма')
+        assert response.status_code == 200
+        names = [title['name'] for title in response.json()['results']]
+        assert names == ['Драма в трёх актах', 'Проект'], (
+            'Проверьте, что поиск `search=` находит совпадения в названии и '
+            'описании и ставит совпадения в названии выше'
+        )
+        response = client.get('/api/v1/titles/?search=пик')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], 'Проверьте, что поиск учитывает начало слова'
+        assert client.get('/api/v1/titles/?search="*').json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Кругосветка'}
+        )
+        assert client.get('/api/v1/titles/?search=Поворот').json()['count'] == 0
+        assert client.get('/api/v1/titles/?search=кругосветка').json()['count'] == 1
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert client.get('/api/v1/titles/?search=кругосветка').json()['count'] == 0
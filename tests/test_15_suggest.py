@@ -0,0 +1,51 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test15TitleSuggest:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_suggest(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Поворот обратно', 'year': 2001,
+            'genre': ['drama'], 'category': 'films',
+        })
+        response = client.get('/api/v1/titles/suggest/?q=пов')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/suggest/` доступен без авторизации'
+        )
+        data = response.json()
+        assert [title['name'] for title in data] == [
+            'Поворот туда', 'Поворот обратно'
+        ], 'Проверьте, что подсказки упорядочены по рейтингу'
+        assert data[0] == {
+            'id': titles[0]['id'], 'name': 'Поворот туда', 'rating': 4
+        }
+        assert data[1]['rating'] is None
+        assert client.get('/api/v1/titles/suggest/?q=обр пов').json()[0][
+            'name'] == 'Поворот обратно', (
+            'Проверьте, что подсказки ищут все слова запроса по началу слов'
+        )
+        assert client.get('/api/v1/titles/suggest/?q=вор').json() == []
+        assert len(client.get('/api/v1/titles/suggest/?q=п&limit=1').json()) == 1
+        assert client.get('/api/v1/titles/suggest/?q=п&limit=0').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_suggest_follows_changes(self, client, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get('/api/v1/titles/suggest/?q=проект').json()[0][
+            'rating'] is None
+        admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 9}
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Проект Ё'}
+        )
+        assert client.get('/api/v1/titles/suggest/?q=проект е').json() == [
+            {'id': titles[1]['id'], 'name': 'Проект Ё', 'rating': 9}
+        ], 'Проверьте, что индекс подсказок обновляется при изменениях'
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert client.get('/api/v1/titles/suggest/?q=проект').json() == []
@@ -0,0 +1,62 @@
+import pytest
+
+from reviews.models import Review, Title
+
+from .common import auth_client, create_reviews
+
+
+class Test16TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/stats/` '
+            'без токена авторизации возвращается статус 200'
+        )
+        data = response.json()
+        assert data['histogram'] == {
+            str(score): int(score in (3, 4, 5)) for score in range(1, 11)
+        }, 'Проверьте, что гистограмма считает отзывы по оценкам'
+        assert data['count'] == 3 and data['average'] == 4
+        assert data['median'] == 4
+        assert data['percentiles'] == {'p25': 3, 'p75': 5, 'p90': 5}
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10}
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        data = client.get(url).json()
+        assert data['histogram']['3'] == 0 and data['histogram']['5'] == 0
+        assert data['histogram']['10'] == 1, (
+            'Проверьте, что гистограмма обновляется при изменении и удалении '
+            'отзывов'
+        )
+        assert data['median'] == 7 and data['average'] == 7
+
+        data = client.get(f'/api/v1/titles/{titles[1]["id"]}/stats/').json()
+        assert data['count'] == 0 and data['median'] is None
+        assert client.get('/api/v1/titles/0/stats/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_concurrent_score_changes(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        first = Review.objects.get(pk=reviews[0]['id'])
+        second = Review.objects.get(pk=reviews[0]['id'])
+        first.score = 8
+        first.save()
+        # второй запрос загрузил отзыв до сохранения первого
+        second.score = 2
+        second.save()
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.score_sum == 2 + 3 + 4, (
+            'Проверьте, что сумма оценок поправляется на разницу с оценкой, '
+            'сохранённой в базе, а не загруженной в объект'
+        )
+        assert title.histogram == [0, 1, 1, 1, 0, 0, 0, 0, 0, 0]
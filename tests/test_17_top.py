@@ -0,0 +1,92 @@
+import pytest
+
+from reviews.leaderboard import title_leaderboard
+from reviews.suggest import title_suggest_index
+
+from .common import auth_client, create_titles
+
+
+class Test17TitleTop:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top(self, client, admin_client, django_user_model):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Скука', 'year': 2010,
+            'genre': [genres[1]['slug']], 'category': categories[0]['slug'],
+        })
+        titles.append(response.json())
+        clients = [
+            auth_client(django_user_model.objects.create_user(
+                username=f'reviewer{i}', email=f'reviewer{i}@yamdb.fake'
+            ))
+            for i in range(4)
+        ]
+        for title, scores in zip(titles, ([9] * 4, [10], [2] * 4)):
+            for uclient, score in zip(clients, scores):
+                uclient.post(
+                    f'/api/v1/titles/{title["id"]}/reviews/',
+                    data={'text': 'Отзыв', 'score': score}
+                )
+
+        response = client.get('/api/v1/titles/top/')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/top/` доступен без авторизации'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            titles[0]['id'], titles[1]['id'], titles[2]['id']
+        ], (
+            'Проверьте, что рейтинг упорядочен по байесовской оценке, '
+            'а не по средней'
+        )
+        assert data[0]['weighted_rating'] == 7.33
+        assert data[1]['rating'] == 10 and data[1]['reviews_count'] == 1
+        response = client.get(
+            f'/api/v1/titles/top/?genre={genres[1]["slug"]}&limit=1'
+        )
+        assert [title['id'] for title in response.json()] == [titles[0]['id']]
+        response = client.get(
+            f'/api/v1/titles/top/?category={categories[1]["slug"]}'
+        )
+        assert [title['id'] for title in response.json()] == [titles[1]['id']]
+        assert client.get(
+            '/api/v1/titles/top/?category=films&genre=drama'
+        ).status_code == 400
+
+        reviews = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        ).json()['results']
+        clients[0].delete(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[2]["id"]}/',
+            data={'category': categories[1]['slug']}
+        )
+        response = client.get(
+            f'/api/v1/titles/top/?category={categories[1]["slug"]}'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[2]['id']
+        ], 'Проверьте, что рейтинги обновляются при изменении отзывов и произведений'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reset_during_read(self, client, admin_client, monkeypatch):
+        create_titles(admin_client)
+        for index in (title_leaderboard, title_suggest_index):
+            ensure_loaded = index.ensure_loaded
+
+            def reset_after_load(index=index, ensure_loaded=ensure_loaded):
+                # изменение жанра или категории в другом потоке
+                snapshot = ensure_loaded()
+                index.reset()
+                return snapshot
+
+            monkeypatch.setattr(index, 'ensure_loaded', reset_after_load)
+        assert client.get('/api/v1/titles/top/').status_code == 200, (
+            'Проверьте, что сброс рейтинга во время запроса не приводит '
+            'к ошибке'
+        )
+        response = client.get('/api/v1/titles/suggest/?q=Ба')
+        assert response.status_code == 200
@@ -0,0 +1,42 @@
+import pytest
+from django.core.cache import cache
+
+from .common import create_comments
+
+
+def get_both(client, settings, url):
+    responses = []
+    for rows_list in (False, True):
+        settings.API_ROWS_LIST = rows_list
+        cache.clear()
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        responses.append(response.content)
+    return responses
+
+
+class Test18RowsList:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_json(self, client, admin_client, admin, settings):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        # у произведения без категории сериализатор отдаёт пустые строки
+        assert admin_client.delete('/api/v1/categories/books/').status_code == 204
+        title_url = f'/api/v1/titles/{titles[0]["id"]}'
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?genre=comedy',
+            '/api/v1/titles/?pagination=cursor',
+            f'{title_url}/reviews/',
+            f'{title_url}/reviews/?pagination=cursor',
+            f'{title_url}/reviews/{reviews[0]["id"]}/comments/',
+            f'{title_url}/reviews/{reviews[0]["id"]}/comments/?count=false',
+        )
+        for url in urls:
+            serialized, rows = get_both(client, settings, url)
+            assert serialized == rows, (
+                f'Проверьте, что список `{url}`, построенный из строк values(), '
+                'совпадает с ответом сериализатора'
+            )
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from api_yamdb.asgi import application
+
+from .common import create_reviews
+
+
+def asgi_get(path, query_string=b'', headers=()):
+    async def request():
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await application({
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'query_string': query_string,
+            'headers': list(headers),
+            'server': ('testserver', 80),
+        }, receive, send)
+        return messages
+
+    return request()
+
+
+class Test19Asgi:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_asgi_reads(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        paths = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        )
+
+        async def gather():
+            return await asyncio.gather(*(asgi_get(path) for path in paths))
+
+        for path, messages in zip(paths, asyncio.run(gather())):
+            assert messages[0]['status'] == 200, (
+                f'Проверьте, что ASGI-приложение отдаёт `{path}`'
+            )
+            assert messages[-1] == {'type': 'http.response.body', 'body': b''}
+            body = b''.join(message.get('body', b'') for message in messages)
+            assert json.loads(body) == client.get(path).json()
+
+        etag = client.get(paths[2])['ETag']
+        messages = asyncio.run(asgi_get(
+            paths[2], headers=[(b'if-none-match', etag.encode())]
+        ))
+        assert messages[0]['status'] == 304, (
+            'Проверьте, что заголовки запроса передаются в WSGI-окружение'
+        )
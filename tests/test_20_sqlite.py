@@ -0,0 +1,19 @@
+import pytest
+from django.db import connection
+
+
+class Test20SqlitePragmas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas(self):
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что соединение с SQLite открывается '
+                'с `synchronous = NORMAL`'
+            )
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 5000
+            cursor.execute('PRAGMA cache_size')
+            assert cursor.fetchone()[0] == -20000
@@ -0,0 +1,80 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.recorder import MigrationRecorder
+
+
+def migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets, at_end=True).apps
+
+
+def leaf_nodes():
+    return MigrationExecutor(connection).loader.graph.leaf_nodes()
+
+
+class Test21Migrations:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_counters_backfill(self):
+        apps = migrate(
+            [('users', '0001_initial'), ('reviews', '0001_initial')]
+        )
+        try:
+            User = apps.get_model('users', 'User')
+            Title = apps.get_model('reviews', 'Title')
+            Review = apps.get_model('reviews', 'Review')
+            Comments = apps.get_model('reviews', 'Comments')
+            first = User.objects.create(username='first', email='f@yamdb.fake')
+            second = User.objects.create(
+                username='second', email='s@yamdb.fake'
+            )
+            title = Title.objects.create(name='Один', year=2000)
+            Title.objects.create(name='Два', year=2001)
+            review = Review.objects.create(
+                title=title, author=first, text='Текст', score=8
+            )
+            Review.objects.create(
+                title=title, author=second, text='Текст', score=5
+            )
+            Comments.objects.create(review=review, author=second, text='Да')
+        finally:
+            apps = migrate(leaf_nodes())
+
+        Title = apps.get_model('reviews', 'Title')
+        Review = apps.get_model('reviews', 'Review')
+        title = Title.objects.get(name='Один')
+        assert (title.reviews_count, title.score_sum) == (2, 13), (
+            'Проверьте, что миграция заполняет количество отзывов '
+            'и сумму оценок существующих произведений'
+        )
+        assert (title.score_8, title.score_5, title.score_1) == (1, 1, 0)
+        empty = Title.objects.get(name='Два')
+        assert (empty.reviews_count, empty.score_sum) == (0, 0)
+        assert Review.objects.get(score=8).comments_count == 1, (
+            'Проверьте, что миграция заполняет количество комментариев '
+            'к существующим отзывам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_adopt_migrations(self):
+        recorder = MigrationRecorder(connection)
+        for app_label in ('users', 'reviews'):
+            recorder.record_unapplied(app_label, '0001_initial')
+
+        call_command('adopt_migrations', stdout=StringIO())
+
+        applied = recorder.applied_migrations()
+        assert ('users', '0001_initial') in applied, (
+            'Проверьте, что adopt_migrations отмечает начальную миграцию '
+            'приложения users, если его таблицы уже созданы'
+        )
+        assert ('reviews', '0001_initial') in applied
+        MigrationExecutor(connection).loader.check_consistent_history(
+            connection
+        )